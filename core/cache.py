@@ -0,0 +1,114 @@
+import functools, hashlib, threading, time
+
+from collections       import OrderedDict
+from urllib.parse      import urlencode
+
+from django.conf       import settings
+from django.core.cache import caches
+from django.db         import transaction
+from django.http       import HttpResponse, HttpResponseNotModified
+
+
+class TTLCache:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self.data    = OrderedDict()
+        self.lock    = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                expires_at, value = self.data[key]
+            except KeyError:
+                return default
+
+            if expires_at < time.monotonic():
+                del self.data[key]
+                return default
+
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self.data.move_to_end(key)
+
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def tag_versions(cache, tags):
+    keys     = [f'tag:{tag}' for tag in tags]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            versions[key] = time.time_ns()
+            cache.add(key, versions[key], None)
+
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate_tags(*tags):
+    def bump():
+        response_cache().set_many({f'tag:{tag}': time.time_ns() for tag in tags}, None)
+
+    transaction.on_commit(bump)
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+
+    return any(value.strip() in ('*', etag, 'W/' + etag) for value in header.split(','))
+
+
+def cache_response(namespace, params=(), tags=()):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            cache    = response_cache()
+            tags_now = [tag.format(**kwargs) for tag in tags]
+            query    = urlencode(sorted((param, request.GET[param]) for param in params if request.GET.get(param)))
+            raw_key  = ':'.join([namespace, request.path, query, *tag_versions(cache, tags_now)])
+            key      = 'response:' + hashlib.md5(raw_key.encode()).hexdigest()
+            cached   = cache.get(key)
+
+            if cached is None:
+                response = func(self, request, *args, **kwargs)
+
+                if response.status_code != 200:
+                    return response
+
+                cached = (response.content, response['Content-Type'], '"' + hashlib.md5(response.content).hexdigest() + '"')
+                cache.set(key, cached, settings.RESPONSE_CACHE_TTL[namespace])
+
+            content, content_type, etag = cached
+
+            if etag_matches(request, etag):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(content, content_type=content_type)
+
+            response['ETag'] = etag
+            return response
+
+        return wrapper
+
+    return decorator
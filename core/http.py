@@ -0,0 +1,25 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http                  import JsonResponse as DjangoJsonResponse, HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data, encoder=DjangoJSONEncoder, json_dumps_params=None):
+    if orjson is None or json_dumps_params:
+        return json.dumps(data, cls=encoder, **(json_dumps_params or {})).encode()
+
+    return orjson.dumps(data, default=encoder().default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class JsonResponse(DjangoJsonResponse):
+    def __init__(self, data, encoder=DjangoJSONEncoder, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError('In order to allow non-dict objects to be serialized set the safe parameter to False.')
+
+        kwargs.setdefault('content_type', 'application/json')
+        HttpResponse.__init__(self, content=dumps(data, encoder, json_dumps_params), **kwargs)
@@ -0,0 +1,147 @@
+import asyncio, httpx, json, jwt, statistics, threading, time
+
+from concurrent.futures          import ThreadPoolExecutor
+from http.server                 import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand
+from django.db                   import connections
+from django.test                 import AsyncClient, Client, override_settings
+from django.urls                 import path
+from django.views                import View
+
+from core.http                   import JsonResponse
+from users.kakao                 import close_client
+from users.models                import User
+from users.views                 import KakaoLoginView
+from my_settings                 import SECRET_KEY, ALGORITHM
+
+
+def kakao_server(latency):
+    class KakaoHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = json.dumps({
+                'id'            : 'bench-async-kakao',
+                'kakao_account' : {
+                    'email'   : 'bench-async@example.com',
+                    'profile' : {'nickname': 'benchasync', 'profile_image_url': 'https://example.com/profile.jpg'},
+                },
+            }).encode()
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KakaoHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class SyncKakaoLoginView(View):
+    client = None
+
+    def get(self, request):
+        try:
+            headers  = {'Authorization' : 'Bearer {}'.format(request.headers['Authorization'])}
+            response = self.client.get(settings.KAKAO_API_URL, headers=headers).json()
+
+            user, is_user = KakaoLoginView().get_or_create_user(response)
+        except KeyError:
+            return JsonResponse({'message': 'KEY_ERROR'}, status=400)
+
+        token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
+
+        return JsonResponse({'MESSAGE': 'SUCCESS', 'user_name': user.name, 'TOKEN': token}, status=200 if is_user else 201)
+
+
+urlpatterns = [
+    path('users/login/kakao', KakaoLoginView.as_view()),
+    path('users/login/kakao/sync', SyncKakaoLoginView.as_view()),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare login throughput of a sync view with a pooled httpx.Client served by a fixed pool of worker threads '
+        '(like gunicorn sync workers) and the async KakaoLoginView served on one event loop, against a local Kakao '
+        'stub with a fixed response latency. '
+        'Every request uses a distinct access token so the profile cache is bypassed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50, help='in-flight requests for async serving')
+        parser.add_argument('--workers', type=int, default=4, help='worker threads for sync serving')
+        parser.add_argument('--latency', type=int, default=100, help='Kakao stub latency in ms')
+
+    def run_sync(self, requests, workers):
+        def call(i):
+            start    = time.perf_counter()
+            response = Client(HTTP_AUTHORIZATION=f'bench-sync-token-{i}').get('/users/login/kakao/sync')
+            connections.close_all()
+            return response.status_code, time.perf_counter() - start
+
+        limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+
+        with httpx.Client(timeout=settings.KAKAO_TIMEOUT, limits=limits) as client:
+            SyncKakaoLoginView.client = client
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(call, range(requests)))
+            finally:
+                SyncKakaoLoginView.client = None
+
+    def run_async(self, requests, concurrency):
+        async def run():
+            client    = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call(i):
+                async with semaphore:
+                    start    = time.perf_counter()
+                    response = await client.get('/users/login/kakao', AUTHORIZATION=f'bench-async-token-{i}')
+                    return response.status_code, time.perf_counter() - start
+
+            try:
+                return await asyncio.gather(*[call(i) for i in range(requests)])
+            finally:
+                await close_client()
+
+        return asyncio.run(run())
+
+    def handle(self, *args, **options):
+        server = kakao_server(options['latency'] / 1000)
+        url    = f'http://127.0.0.1:{server.server_address[1]}/v2/user/me'
+
+        self.stdout.write(f"{'mode':<6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+
+        try:
+            with override_settings(KAKAO_API_URL=url, PERFORMANCE_SAMPLE_RATE=0, ROOT_URLCONF=__name__):
+                self.run_sync(1, 1)
+
+                for mode, run in (
+                    ('sync',  lambda: self.run_sync(options['requests'], options['workers'])),
+                    ('async', lambda: self.run_async(options['requests'], options['concurrency'])),
+                ):
+                    start   = time.perf_counter()
+                    results = run()
+                    elapsed = time.perf_counter() - start
+
+                    timings = sorted(duration * 1000 for _, duration in results)
+                    errors  = sum(1 for status, _ in results if status >= 300)
+
+                    self.stdout.write(
+                        f"{mode:<6} {len(results) / elapsed:>8.1f} {statistics.median(timings):>9.1f} "
+                        f"{timings[int(len(timings) * 0.95) - 1]:>9.1f} {errors:>7}"
+                    )
+        finally:
+            server.shutdown()
+            User.objects.filter(kakao_account='bench-async-kakao').delete()
@@ -0,0 +1,103 @@
+import json, statistics, time, tracemalloc
+
+from datetime                     import timedelta
+from decimal                      import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils                 import timezone
+
+from core                         import http
+
+
+def product_list(items):
+    return {
+        'item'        : [{
+            'id'               : i,
+            'name'             : f'제주 감귤 {i}kg 산지직송',
+            'price'            : Decimal(f'{10000 + i * 10}.00'),
+            'ordered_quantity' : i * 3,
+            'stock'            : 100 - i % 100,
+            'image'            : f'https://bucket.s3.amazonaws.com/variants/uploads/1/{i:032x}/list.webp',
+        } for i in range(items)],
+        'next_cursor' : 'eyJpZCI6IDEwMH0',
+    }
+
+
+def detail_page(reviews):
+    now = timezone.now()
+
+    return {'RESULT': [{
+        'product_name'        : '제주 감귤 5kg 산지직송',
+        'seller_name'         : '감귤농장',
+        'seller_image'        : 'https://k.kakaocdn.net/dn/profile.jpg',
+        'product_price'       : Decimal('12000.00'),
+        'product_stock'       : 50,
+        'product_description' : '새콤달콤한 제주 감귤입니다. ' * 20,
+        'product_origin'      : 'DOMESTIC',
+        'product_storage'     : 'COLD',
+        'product_image'       : [f'https://bucket.s3.amazonaws.com/uploads/1/{i:032x}' for i in range(5)],
+        'product_review'      : [{
+            'review_writer' : f'구매자{i}',
+            'review_image'  : f'https://bucket.s3.amazonaws.com/variants/uploads/2/{i:032x}/list.webp',
+            'profile_image' : 'https://k.kakaocdn.net/dn/profile.jpg',
+            'content'       : '맛있어요! 또 주문할게요. ' * 5,
+            'grade'         : i % 5 + 1,
+            'create_at'     : now - timedelta(minutes=i),
+            'comment'       : {
+                'comment_writer'    : '감귤농장',
+                'comment_content'   : '감사합니다!',
+                'comment_create_at' : now - timedelta(seconds=i),
+            } if i % 2 else None,
+        } for i in range(reviews)],
+    }]}
+
+
+def stdlib_dumps(data):
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def measure(dumps, data, iterations):
+    timings = []
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        dumps(data)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    size = len(dumps(data))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak, size
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare stdlib json + DjangoJSONEncoder with core.http.dumps on ProductListView and DetailPageView '
+        'shaped payloads: median serialization time and peak allocation per response.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100, help='products in the list payload')
+        parser.add_argument('--reviews', type=int, default=200, help='reviews in the detail payload')
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        payloads = {
+            'product_list' : product_list(options['items']),
+            'detail_page'  : detail_page(options['reviews']),
+        }
+        encoders = {
+            'json'       : stdlib_dumps,
+            'core.http'  : http.dumps,
+        }
+
+        self.stdout.write(f"encoder: {'orjson' if http.orjson else 'json (orjson not installed)'}")
+        self.stdout.write(f"{'payload':<14} {'encoder':<10} {'median ms':>10} {'peak KiB':>9} {'bytes':>8}")
+
+        for name, data in payloads.items():
+            for encoder, dumps in encoders.items():
+                median, peak, size = measure(dumps, data, options['iterations'])
+                self.stdout.write(f"{name:<14} {encoder:<10} {median:>10.3f} {peak / 1024:>9.1f} {size:>8}")
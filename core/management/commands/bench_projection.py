@@ -0,0 +1,68 @@
+import statistics, time, tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core.seed                    import seed
+from products.models              import Product
+from products.views               import PRODUCT_FIELDS, SELLER_FIELDS
+from reviews.feed                 import ORDERING, project
+from reviews.models               import Review
+from users.models                 import User
+
+
+def querysets(rows):
+    products = Product.objects.exclude(thumbnail=None).order_by('-id')[:rows]
+    reviews  = Review.objects.filter(comment_id=None).order_by(*ORDERING)
+    users    = User.objects.order_by('id')
+
+    return {
+        'product_list'  : (products, Product.objects.exclude(thumbnail=None).values_list(*PRODUCT_FIELDS, 'ordered_quantity', named=True).order_by('-id')[:rows]),
+        'recent_review' : (reviews.select_related('product')[:rows], project(reviews)[:rows]),
+        'seller_list'   : (users[:rows], users.values_list(*SELLER_FIELDS, named=True)[:rows]),
+    }
+
+
+def measure(queryset, repeat):
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows    = list(queryset.all())
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    rows   = list(queryset.all())
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    peak   = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return len(rows), statistics.median(timings), peak, blocks
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare model instances with the values_list projections used by the list views on large result sets: '
+        'median fetch time, tracemalloc peak and live allocated blocks while the rows are held.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--prefix', default='projection', help='dataset prefix; an existing dataset with this prefix is reused')
+
+    def handle(self, *args, **options):
+        rows   = options['rows']
+        prefix = options['prefix']
+
+        if User.objects.filter(kakao_account__startswith=f'{prefix}-seller-').exists():
+            self.stdout.write(f"reusing dataset '{prefix}'")
+        else:
+            sellers = max(1, rows // 100)
+            seed(sellers, max(1, -(-rows // sellers)), 1, prefix=prefix, log=self.stdout.write)
+
+        self.stdout.write(f"{'query':<14} {'fetch':<10} {'rows':>6} {'median ms':>10} {'peak KiB':>9} {'blocks':>8}")
+
+        for name, (instances, projection) in querysets(rows).items():
+            for fetch, queryset in (('instances', instances), ('projection', projection)):
+                count, median, peak, blocks = measure(queryset, options['repeat'])
+                self.stdout.write(f"{name:<14} {fetch:<10} {count:>6} {median:>10.2f} {peak / 1024:>9.1f} {blocks:>8}")
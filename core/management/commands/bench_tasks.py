@@ -0,0 +1,38 @@
+import time
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand
+
+from core.models                 import Task
+from core.tasks                  import enqueue_many, load_tasks
+from core.management.commands    import run_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure worker throughput: queue --tasks core.sleep tasks and drain them with run_tasks at each '
+        '--concurrency level. Run it against an idle queue; anything already pending is drained too.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=500)
+        parser.add_argument('--ms', type=int, default=20, help='simulated work per task')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[0, 1, 4, 8, 16])
+        parser.add_argument('--batch', type=int, default=settings.TASK_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        load_tasks()
+        worker = run_tasks.Command(stdout=self.stdout, stderr=self.stderr)
+
+        self.stdout.write(f"{'concurrency':>11} {'tasks':>6} {'seconds':>8} {'tasks/s':>8}")
+
+        for concurrency in options['concurrency']:
+            enqueue_many('core.sleep', [{'ms': options['ms']}] * options['tasks'])
+
+            started   = time.perf_counter()
+            processed = worker.run({'concurrency': concurrency, 'batch': options['batch'], 'once': True, 'sleep': 0})
+            elapsed   = time.perf_counter() - started
+
+            self.stdout.write(f"{concurrency:>11} {processed:>6} {elapsed:>8.2f} {processed / elapsed:>8.1f}")
+
+        Task.objects.filter(name='core.sleep', status=Task.Status.DEAD).delete()
@@ -0,0 +1,190 @@
+import json, jwt, math, platform, subprocess, time
+
+from datetime                    import datetime
+from unittest.mock               import AsyncMock, patch
+
+from django                      import get_version
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection
+from django.test                 import Client, override_settings
+
+from core.seed                   import seed, seeded_ids
+from core.utils                  import QueryCollector
+from products.models             import Product
+from users.models                import User
+from my_settings                 import SECRET_KEY, ALGORITHM
+
+
+def endpoints(ids):
+    product_id, seller_id, review_id = ids['product_id'], ids['seller_id'], ids['review_id']
+
+    return [
+        ('search',           'GET',  '/products/search?keyword=망고', None, None),
+        ('seller_list',      'GET',  '/products/seller', None, None),
+        ('seller_category',  'GET',  '/products/seller?category=DOMESTIC', None, None),
+        ('seller_order',     'GET',  '/products/seller?order_by=order&category=COLD', None, None),
+        ('product_list',     'GET',  '/products/product?order_by=order&category=FROZEN', None, None),
+        ('seller_products',  'GET',  f'/products/seller/{seller_id}?category=DRY', None, None),
+        ('product_detail',   'GET',  f'/products/{product_id}', None, None),
+        ('review_check',     'POST', f'/products/{product_id}', 'buyer', {}),
+        ('my_products',      'GET',  f'/products?product_id={product_id}', 'seller', None),
+        ('purchase',         'POST', f'/products/{product_id}/purchase', 'buyer', {'quantity': 1}),
+        ('checkout',         'POST', '/products/checkout', 'buyer', {'items': [{'product_id': product_id, 'quantity': 1}]}),
+        ('recent_reviews',   'GET',  '/reviews/recent', None, None),
+        ('comments',         'GET',  f'/reviews/{product_id}/comment', None, None),
+        ('comment_post',     'POST', f'/reviews/{product_id}/comment', 'seller', {'review_id': review_id, 'content': 'benchmark'}),
+        ('kakao_login',      'GET',  '/users/login/kakao', 'kakao', None),
+    ]
+
+
+def percentile(timings, rank):
+    ordered = sorted(timings)
+    return ordered[max(0, math.ceil(len(ordered) * rank / 100) - 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def kakao_profile(prefix):
+    return {
+        'id'            : f'{prefix}-kakao',
+        'kakao_account' : {
+            'email'   : f'{prefix}@example.com',
+            'profile' : {'nickname': f'{prefix}kakao', 'profile_image_url': 'https://example.com/profile.jpg'},
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed (or reuse) a synthetic dataset, replay every public endpoint with the test client and report '
+        'p50/p95/p99 latency and query counts. Results are written as JSON so runs can be compared across commits. '
+        'The Kakao profile call is stubbed; S3 upload endpoints are not replayed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', type=int, default=100)
+        parser.add_argument('--products', type=int, default=100, help='products per seller')
+        parser.add_argument('--reviews', type=int, default=5, help='reviews per product')
+        parser.add_argument('--prefix', default='bench', help='dataset prefix; an existing dataset with this prefix is reused')
+        parser.add_argument('--requests', type=int, default=100, help='timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--only', nargs='+', help='endpoint names to run')
+        parser.add_argument('--cache', action='store_true', help='keep the response cache enabled')
+        parser.add_argument('--output', help='defaults to benchmark-<commit>.json')
+        parser.add_argument('--compare', help='previous result file to diff p50/p95 against')
+
+    def prepare(self, options):
+        prefix = options['prefix']
+
+        if User.objects.filter(kakao_account__startswith=f'{prefix}-seller-').exists():
+            self.stdout.write(f"reusing dataset '{prefix}'")
+        else:
+            start = time.perf_counter()
+            seed(options['sellers'], options['products'], options['reviews'], prefix=prefix, log=self.stdout.write)
+            self.stdout.write(f"seeded dataset '{prefix}' in {time.perf_counter() - start:.1f}s")
+
+        ids = seeded_ids(prefix)
+        Product.objects.filter(id=ids['product_id']).update(stock=10**9)
+        User.objects.filter(id=ids['buyer_id']).update(point=10**9)
+        return ids
+
+    def run_endpoint(self, client, method, path, body, options):
+        def call():
+            if method == 'GET':
+                return client.get(path)
+            return client.post(path, json.dumps(body), content_type='application/json')
+
+        for _ in range(options['warmup']):
+            call()
+
+        timings, queries = [], []
+        for _ in range(options['requests']):
+            collector = QueryCollector()
+            start     = time.perf_counter()
+            with connection.execute_wrapper(collector):
+                response = call()
+            timings.append((time.perf_counter() - start) * 1000)
+            queries.append(collector.count)
+
+        return {
+            'method'   : method,
+            'path'     : path,
+            'status'   : response.status_code,
+            'requests' : len(timings),
+            'p50_ms'   : round(percentile(timings, 50), 3),
+            'p95_ms'   : round(percentile(timings, 95), 3),
+            'p99_ms'   : round(percentile(timings, 99), 3),
+            'mean_ms'  : round(sum(timings) / len(timings), 3),
+            'queries'  : max(queries),
+        }
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+
+        overrides = {'PERFORMANCE_SAMPLE_RATE': 0, 'RATE_LIMITS': {}}
+        if not options['cache']:
+            overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+        ids     = self.prepare(options)
+        prefix  = options['prefix']
+        clients = {
+            None     : Client(),
+            'buyer'  : Client(HTTP_AUTHORIZATION=jwt.encode({'id': ids['buyer_id']}, SECRET_KEY, algorithm=ALGORITHM)),
+            'seller' : Client(HTTP_AUTHORIZATION=jwt.encode({'id': ids['seller_id']}, SECRET_KEY, algorithm=ALGORITHM)),
+            'kakao'  : Client(HTTP_AUTHORIZATION=f'{prefix}-kakao-token'),
+        }
+        results = {}
+
+        self.stdout.write(f"{'endpoint':<16} {'code':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql':>5}")
+
+        with override_settings(**overrides), patch('users.views.fetch_profile', AsyncMock(return_value=kakao_profile(prefix))):
+            for name, method, path, auth, body in endpoints(ids):
+                if options['only'] and name not in options['only']:
+                    continue
+
+                results[name] = self.run_endpoint(clients[auth], method, path, body, options)
+                result        = results[name]
+                self.stdout.write(
+                    f"{name:<16} {result['status']:>4} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['queries']:>4}q"
+                )
+
+        commit = git_commit()
+        report = {
+            'commit'     : commit,
+            'created_at' : datetime.now().isoformat(),
+            'python'     : platform.python_version(),
+            'django'     : get_version(),
+            'database'   : connection.vendor,
+            'cache'      : options['cache'],
+            'dataset'    : {
+                'prefix'   : prefix,
+                'sellers'  : User.objects.filter(kakao_account__startswith=f'{prefix}-seller-').count(),
+                'products' : Product.objects.filter(user__kakao_account__startswith=f'{prefix}-seller-').count(),
+            },
+            'endpoints'  : results,
+        }
+
+        output = options['output'] or f"benchmark-{(commit or 'unknown')[:7]}.json"
+        with open(output, 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self.stdout.write(f"wrote {output}")
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)['endpoints']
+
+            for name, result in results.items():
+                if name in previous:
+                    before = previous[name]
+                    self.stdout.write(
+                        f"{name:<16} p50 {before['p50_ms']:.2f} -> {result['p50_ms']:.2f}  "
+                        f"p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f}  "
+                        f"queries {before['queries']} -> {result['queries']}"
+                    )
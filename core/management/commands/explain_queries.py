@@ -0,0 +1,105 @@
+import json, jwt
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection, transaction
+from django.test                 import Client, override_settings
+
+from core.pagination             import encode_cursor
+from core.seed                   import seed
+from my_settings                 import SECRET_KEY, ALGORITHM
+
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+
+
+def requests_for(ids):
+    product_id, seller_id = ids['product_id'], ids['seller_id']
+
+    return [
+        ('GET',  '/products/search?keyword=망고', None),
+        ('GET',  '/products/seller', None),
+        ('GET',  '/products/seller?category=DOMESTIC', None),
+        ('GET',  '/products/seller?order_by=order&category=COLD', None),
+        ('GET',  '/products/seller?order_by=id', None),
+        ('GET',  '/products/product?order_by=order&category=FROZEN', None),
+        ('GET',  '/products/product?order_by=order', None),
+        ('GET',  f"/products/product?order_by=order&cursor={encode_cursor([5, product_id])}", None),
+        ('GET',  '/products/product', None),
+        ('GET',  f'/products/seller/{seller_id}?category=DRY', None),
+        ('GET',  f'/products/{product_id}', None),
+        ('POST', f'/products/{product_id}', {}),
+        ('GET',  f'/products?product_id={product_id}', None),
+        ('POST', f'/products/{product_id}/purchase', {'quantity': 1}),
+        ('POST', '/products/checkout', {'items': [{'product_id': product_id, 'quantity': 1}]}),
+        ('GET',  '/reviews/recent', None),
+        ('GET',  f'/reviews/{product_id}/comment', None),
+        ('POST', f'/reviews/{product_id}/comment', {'review_id': 0, 'content': 'explain'}),
+    ]
+
+
+def explain(sql, params):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [
+                row[-1] for row in cursor.fetchall()
+                if row[-1].startswith('SCAN ') and ' USING ' not in row[-1]
+            ]
+
+        cursor.execute('EXPLAIN ' + sql, params)
+        columns = [column[0].lower() for column in cursor.description]
+        return [
+            f"{row['table']} (type=ALL, rows={row.get('rows')})"
+            for row in (dict(zip(columns, values)) for values in cursor.fetchall())
+            if row.get('type') == 'ALL'
+        ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway dataset, replay every view against it, EXPLAIN each query and report full table scans. '
+        'Everything runs inside a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', type=int, default=50)
+        parser.add_argument('--products', type=int, default=20, help='products per seller')
+        parser.add_argument('--reviews', type=int, default=3, help='reviews per product')
+        parser.add_argument('--fail-on-scan', action='store_true')
+
+    def handle(self, *args, **options):
+        scans = 0
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}), transaction.atomic():
+            ids    = seed(options['sellers'], options['products'], options['reviews'], prefix='explain')
+            token  = jwt.encode({'id': ids['buyer_id']}, SECRET_KEY, algorithm=ALGORITHM)
+            client = Client(HTTP_AUTHORIZATION=token)
+
+            for method, path, body in requests_for(ids):
+                captured = []
+
+                def capture(execute, sql, params, many, context):
+                    captured.append((sql, params))
+                    return execute(sql, params, many, context)
+
+                with connection.execute_wrapper(capture):
+                    if method == 'GET':
+                        response = client.get(path)
+                    else:
+                        response = client.post(path, json.dumps(body), content_type='application/json')
+
+                statements = [(sql, params) for sql, params in captured if sql.lstrip().upper().startswith(EXPLAINABLE)]
+                self.stdout.write(f"{method} {path} -> {response.status_code}, {len(statements)} queries")
+
+                for sql, params in statements:
+                    for scan in explain(sql, params):
+                        scans += 1
+                        self.stdout.write(self.style.WARNING(f"    FULL SCAN {scan}"))
+                        self.stdout.write(f"        {sql[:200]}")
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{scans} full scans found")
+
+        if scans and options['fail_on_scan']:
+            raise CommandError('full table scans detected')
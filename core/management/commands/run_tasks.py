@@ -0,0 +1,64 @@
+import time
+
+from concurrent.futures          import ThreadPoolExecutor
+
+from django.conf                 import settings
+from django.core.management.base import BaseCommand
+from django.db                   import connections
+
+from core                        import tasks
+
+
+def execute(task):
+    try:
+        return tasks.execute(task)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued background tasks from the tasks table. Failed tasks are retried with exponential backoff and '
+        'moved to the dead state after TASK_MAX_ATTEMPTS; tasks whose worker died become visible again after '
+        'TASK_VISIBILITY_TIMEOUT. Start several of these for more throughput.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.TASK_CONCURRENCY, help='0 runs tasks inline')
+        parser.add_argument('--batch', type=int, default=settings.TASK_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=1.0, help='seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='exit when no task is ready')
+        parser.add_argument('--retry-dead', nargs='*', metavar='NAME', help='requeue dead tasks (optionally only these names) and exit')
+
+    def handle(self, *args, **options):
+        tasks.load_tasks()
+
+        if options['retry_dead'] is not None:
+            self.stdout.write(self.style.SUCCESS(f"requeued {tasks.retry_dead(options['retry_dead'])} dead tasks"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"processed {self.run(options)} tasks"))
+
+    def run(self, options):
+        processed = 0
+        pool      = ThreadPoolExecutor(max_workers=options['concurrency']) if options['concurrency'] > 0 else None
+
+        try:
+            while True:
+                batch = tasks.claim(options['batch'])
+
+                if not batch:
+                    if options['once']:
+                        return processed
+                    time.sleep(options['sleep'])
+                    continue
+
+                results    = list(pool.map(execute, batch)) if pool else [tasks.execute(task) for task in batch]
+                processed += len(results)
+
+                for task, ok in zip(batch, results):
+                    if not ok:
+                        self.stderr.write(f"task {task.id} {task.name} failed (attempt {task.attempts})")
+        finally:
+            if pool:
+                pool.shutdown()
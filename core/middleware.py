@@ -0,0 +1,83 @@
+import asyncio, json, logging, random, time
+
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from core.utils  import QueryCollector
+
+
+logger          = logging.getLogger('gwapang.performance')
+query_collector = ContextVar('query_collector', default=None)
+
+
+def collect_queries(execute, sql, params, many, context):
+    collector = query_collector.get()
+
+    if collector is None:
+        return execute(sql, params, many, context)
+
+    return collector(execute, sql, params, many, context)
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable  = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start     = time.perf_counter()
+        token     = query_collector.set(collector)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            query_collector.reset(token)
+
+        return self.record(request, response, collector, start)
+
+    async def __acall__(self, request):
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        collector = QueryCollector()
+        start     = time.perf_counter()
+        token     = query_collector.set(collector)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_collector.reset(token)
+
+        return self.record(request, response, collector, start)
+
+    def record(self, request, response, collector, start):
+        elapsed = time.perf_counter() - start
+        timing  = f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries", app;dur={elapsed * 1000:.1f}'
+
+        response['Server-Timing'] = f"{response['Server-Timing']}, {timing}" if response.has_header('Server-Timing') else timing
+
+        logger.info(json.dumps({
+            'method'      : request.method,
+            'path'        : request.path,
+            'status'      : response.status_code,
+            'queries'     : collector.count,
+            'db_ms'       : round(collector.duration * 1000, 2),
+            'view_ms'     : round(elapsed * 1000, 2),
+            'slowest_ms'  : round(collector.slowest_duration * 1000, 2),
+            'slowest_sql' : collector.slowest_sql,
+        }, ensure_ascii=False))
+
+        return response
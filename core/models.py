@@ -1,3 +1,24 @@
-from django.db import models
+from django.db    import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Task(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        DEAD    = 'dead'
+
+    name         = models.CharField(max_length=100)
+    payload      = models.JSONField(default=dict)
+    status       = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts     = models.IntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    error        = models.TextField(null=True)
+    create_at    = models.DateTimeField(auto_now_add=True)
+    update_at    = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'tasks'
+        indexes  = [
+            models.Index(fields=['status', 'available_at']),
+        ]
@@ -0,0 +1,93 @@
+import base64, binascii, json
+
+from django.conf            import settings
+from django.core.exceptions import ValidationError
+from django.db.models       import Q
+
+
+class PaginationError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def cursor_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, default=cursor_value, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, binascii.Error):
+        raise PaginationError('INVALID_CURSOR')
+
+    if not isinstance(values, list):
+        raise PaginationError('INVALID_CURSOR')
+
+    return values
+
+
+def cursor_values(model, ordering, values):
+    if len(values) != len(ordering):
+        raise PaginationError('INVALID_CURSOR')
+
+    try:
+        values = [model._meta.get_field(field.lstrip('-')).to_python(value) for field, value in zip(ordering, values)]
+    except (ValueError, TypeError, ValidationError):
+        raise PaginationError('INVALID_CURSOR')
+
+    if None in values:
+        raise PaginationError('INVALID_CURSOR')
+
+    return values
+
+
+def row_cursor(row, ordering):
+    return encode_cursor([getattr(row, field.lstrip('-')) for field in ordering])
+
+
+def page_size(limit):
+    if limit in (None, ''):
+        return settings.PAGE_SIZE
+
+    if not str(limit).isdigit() or int(limit) < 1:
+        raise PaginationError('INVALID_LIMIT')
+
+    return min(int(limit), settings.MAX_PAGE_SIZE)
+
+
+def keyset_q(ordering, values):
+    q = Q()
+
+    for i, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        clause = Q(**{f"{field.lstrip('-')}__{lookup}": values[i]})
+
+        for previous, value in zip(ordering[:i], values[:i]):
+            clause &= Q(**{previous.lstrip('-'): value})
+
+        q |= clause
+
+    return q
+
+
+def paginate(queryset, ordering, cursor=None, limit=None):
+    limit = page_size(limit)
+
+    if cursor:
+        values   = cursor_values(queryset.model, ordering, decode_cursor(cursor))
+        queryset = queryset.filter(keyset_q(ordering, values))
+
+    rows        = list(queryset.order_by(*ordering)[:limit+1])
+    next_cursor = None
+
+    if len(rows) > limit:
+        rows        = rows[:limit]
+        next_cursor = row_cursor(rows[-1], ordering)
+
+    return rows, next_cursor
@@ -0,0 +1,82 @@
+import math, threading, time
+
+from django.conf       import settings
+from django.core.cache import caches
+
+from core.cache        import TTLCache
+
+
+class LocalCounters:
+    def __init__(self, maxsize):
+        self.cache = TTLCache(maxsize, 0)
+        self.lock  = threading.Lock()
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def incr(self, key, delta, ttl):
+        with self.lock:
+            value = self.cache.get(key, 0) + delta
+            self.cache.set(key, value, ttl)
+
+        return value
+
+    def clear(self):
+        self.cache.clear()
+
+
+class CacheCounters:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def incr(self, key, delta, ttl):
+        self.cache.add(key, 0, ttl)
+
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            self.cache.set(key, delta, ttl)
+            return delta
+
+    def clear(self):
+        self.cache.clear()
+
+
+local_counters = LocalCounters(settings.RATE_LIMIT_SIZE)
+
+
+def counters():
+    return CacheCounters(caches[settings.RATE_LIMIT_ALIAS]) if settings.RATE_LIMIT_ALIAS else local_counters
+
+
+def retry_after(limit, period, elapsed, previous, current):
+    if current < limit:
+        wait = period * (1 - (limit - current - 1) / previous) - elapsed
+    else:
+        wait = period - elapsed + period * (1 - (limit - 1) / current)
+
+    return max(1, math.ceil(wait))
+
+
+def acquire(key, limit, period, now=None):
+    now      = time.time() if now is None else now
+    window   = int(now // period)
+    elapsed  = now - window * period
+    slot     = f'{key}:{window}'
+    store    = counters()
+    previous = store.get(f'{key}:{window - 1}')
+    current  = store.incr(slot, 1, 2 * period)
+
+    if previous * (1 - elapsed / period) + current <= limit:
+        return (slot, 2 * period), None
+
+    store.incr(slot, -1, 2 * period)
+    return None, retry_after(limit, period, elapsed, previous, current - 1)
+
+
+def release(slot):
+    key, ttl = slot
+    counters().incr(key, -1, ttl)
@@ -0,0 +1,8 @@
+from django.conf        import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.ASYNC_DB_THREAD_SENSITIVE = True
@@ -0,0 +1,112 @@
+import random
+
+from products.models import Origin, Storage, Product, Image, Order, SearchToken, SellerToken
+from products.search import product_tokens, seller_tokens
+from products.stats  import rebuild as rebuild_stats
+from reviews.models  import Review
+from users.models    import User
+
+
+FRUITS = ['사과', '배', '망고', '포도', '귤', '딸기', '수박', '참외', '복숭아', '자두']
+
+
+def seed(sellers=10, products_per_seller=10, reviews_per_product=5, prefix='seed', batch_size=1000, log=None):
+    rng = random.Random(prefix)
+
+    for origin in Origin.Type:
+        Origin.objects.get_or_create(id=origin.value, defaults={'name': origin.name})
+
+    for storage in Storage.Type:
+        Storage.objects.get_or_create(id=storage.value, defaults={'name': storage.name})
+
+    User.objects.bulk_create(
+        [
+            User(kakao_account=f'{prefix}-{role}-{i}', name=f'{prefix}{role}{i}', profile_image='', email=None, point=10**9)
+            for role in ('seller', 'buyer') for i in range(sellers)
+        ],
+        batch_size = batch_size
+    )
+
+    seller_rows = list(User.objects.filter(kakao_account__startswith=f'{prefix}-seller-').values_list('id', 'name'))
+    buyer_ids   = list(User.objects.filter(kakao_account__startswith=f'{prefix}-buyer-').values_list('id', flat=True))
+
+    SellerToken.objects.bulk_create(
+        [token for user in User.objects.filter(id__in=[row[0] for row in seller_rows]).only('id', 'name') for token in seller_tokens(user)],
+        batch_size = batch_size
+    )
+
+    chunk = max(1, batch_size // max(1, products_per_seller))
+
+    for start in range(0, len(seller_rows), chunk):
+        sellers_chunk = dict(seller_rows[start:start+chunk])
+
+        Product.objects.bulk_create(
+            [
+                Product(
+                    user_id          = user_id,
+                    name             = f'{rng.choice(FRUITS)} {user_id}-{i}',
+                    price            = rng.randrange(1000, 100000, 100),
+                    ordered_quantity = rng.randrange(0, 1000),
+                    description      = f'{rng.choice(FRUITS)} 산지 직송 상품입니다',
+                    stock            = rng.randrange(0, 1000),
+                    origin_id        = rng.choice(Origin.Type.values),
+                    storage_id       = rng.choice(Storage.Type.values)
+                ) for user_id in sellers_chunk for i in range(products_per_seller)
+            ],
+            batch_size = batch_size
+        )
+
+        products = list(Product.objects.filter(user_id__in=sellers_chunk, thumbnail=None).only('id', 'user_id', 'name', 'description'))
+
+        for product in products:
+            product.thumbnail = f'https://example.com/{prefix}/{product.id}.jpg'
+
+        Product.objects.bulk_update(products, ['thumbnail'], batch_size=batch_size)
+        Image.objects.bulk_create(
+            [Image(product_id=product.id, url=product.thumbnail, is_thumbnail=True, image_uuid=f'{prefix}-{product.id}') for product in products],
+            batch_size = batch_size
+        )
+        SearchToken.objects.bulk_create(
+            [token for product in products for token in product_tokens(product, sellers_chunk[product.user_id])],
+            batch_size = batch_size
+        )
+
+        if reviews_per_product and buyer_ids:
+            pairs = [(product, rng.choice(buyer_ids)) for product in products for _ in range(reviews_per_product)]
+
+            Order.objects.bulk_create(
+                [Order(user_id=buyer_id, product_id=product.id, quantity=1) for product, buyer_id in pairs],
+                batch_size = batch_size
+            )
+            Review.objects.bulk_create(
+                [
+                    Review(
+                        user_id    = buyer_id,
+                        product_id = product.id,
+                        image_url  = f'https://example.com/{prefix}/review.jpg',
+                        grade      = str(rng.randint(1, 5)),
+                        content    = f'{product.name} 후기입니다'
+                    ) for product, buyer_id in pairs
+                ],
+                batch_size = batch_size
+            )
+
+        if log:
+            log(f"seeded products for sellers {start + len(sellers_chunk)}/{len(seller_rows)}")
+
+    rebuild_stats()
+
+    return seeded_ids(prefix)
+
+
+def seeded_ids(prefix='seed'):
+    seller_id  = User.objects.filter(kakao_account__startswith=f'{prefix}-seller-').order_by('id').values_list('id', flat=True).first()
+    buyer_id   = User.objects.filter(kakao_account__startswith=f'{prefix}-buyer-').order_by('id').values_list('id', flat=True).first()
+    product_id = Product.objects.filter(user_id=seller_id).order_by('id').values_list('id', flat=True).first() if seller_id else None
+
+    return {
+        'seller_id'  : seller_id,
+        'buyer_id'   : buyer_id,
+        'product_id' : product_id,
+        'review_id'  : Review.objects.filter(product_id=product_id, comment_id=None).order_by('id').values_list('id', flat=True).first(),
+    }
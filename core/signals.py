@@ -0,0 +1,10 @@
+from django.db.backends.signals import connection_created
+from django.dispatch            import receiver
+
+from core.middleware            import collect_queries
+
+
+@receiver(connection_created)
+def install_query_collector(sender, connection, **kwargs):
+    if collect_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, collect_queries)
@@ -0,0 +1,146 @@
+import asyncio, boto3, os, uuid
+
+from concurrent.futures  import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+from django.conf         import settings
+
+from core.tasks          import enqueue, task
+from my_settings         import ACCESS_KEY_ID, SECRET_ACESS_KEY, BUCKET_NAME
+
+
+DELETE_BATCH_SIZE = 1000
+MISSING_CODES     = ('404', 'NoSuchKey', '403')
+
+executor = ThreadPoolExecutor(max_workers=settings.S3_UPLOAD_WORKERS, thread_name_prefix='s3')
+clients  = {}
+
+
+def s3_client():
+    pid = os.getpid()
+
+    if pid not in clients:
+        clients[pid] = boto3.client(
+            's3',
+            aws_access_key_id     = ACCESS_KEY_ID,
+            aws_secret_access_key = SECRET_ACESS_KEY,
+        )
+
+    return clients[pid]
+
+
+def upload_file(s3_client, file, key):
+    file.seek(0)
+    s3_client.upload_fileobj(
+        file,
+        BUCKET_NAME,
+        key,
+        ExtraArgs = {
+            'ContentType' : file.content_type
+        }
+    )
+    return key
+
+
+def upload_files(s3_client, files):
+    keys    = [str(uuid.uuid4()) for _ in files]
+    futures = [executor.submit(upload_file, s3_client, file, key) for file, key in zip(files, keys)]
+
+    uploaded, error = [], None
+    for future in futures:
+        try:
+            uploaded.append(future.result())
+        except Exception as e:
+            error = error or e
+
+    if error:
+        delete_files(s3_client, uploaded)
+        raise error
+
+    return keys
+
+
+async def upload_files_async(s3_client, files):
+    loop    = asyncio.get_running_loop()
+    keys    = [str(uuid.uuid4()) for _ in files]
+    results = await asyncio.gather(
+        *[loop.run_in_executor(executor, upload_file, s3_client, file, key) for file, key in zip(files, keys)],
+        return_exceptions = True
+    )
+    errors  = [result for result in results if isinstance(result, Exception)]
+
+    if errors:
+        await delete_files_async(s3_client, [result for result in results if isinstance(result, str)])
+        raise errors[0]
+
+    return keys
+
+
+def delete_files(s3_client, keys):
+    keys = [key for key in keys if key]
+
+    for i in range(0, len(keys), DELETE_BATCH_SIZE):
+        s3_client.delete_objects(
+            Bucket = BUCKET_NAME,
+            Delete = {
+                'Objects' : [{'Key': key} for key in keys[i:i+DELETE_BATCH_SIZE]],
+                'Quiet'   : True
+            }
+        )
+
+
+async def delete_files_async(s3_client, keys):
+    await asyncio.get_running_loop().run_in_executor(executor, delete_files, s3_client, list(keys))
+
+
+@task('core.delete_files')
+def delete_files_task(keys):
+    delete_files(s3_client(), keys)
+
+
+def delete_files_later(keys):
+    keys = [key for key in keys if key]
+
+    if keys:
+        enqueue('core.delete_files', keys=keys)
+
+
+def upload_prefix(user_id):
+    return f'{settings.S3_UPLOAD_PREFIX}/{user_id}/'
+
+
+def presign_upload(s3_client, user_id, content_type):
+    key  = f'{upload_prefix(user_id)}{uuid.uuid4()}'
+    post = s3_client.generate_presigned_post(
+        Bucket     = BUCKET_NAME,
+        Key        = key,
+        Fields     = {'Content-Type': content_type},
+        Conditions = [
+            {'Content-Type': content_type},
+            ['content-length-range', 1, settings.S3_PRESIGN_MAX_SIZE],
+        ],
+        ExpiresIn  = settings.S3_PRESIGN_EXPIRES
+    )
+
+    return {'key': key, 'url': post['url'], 'fields': post['fields']}
+
+
+def verify_upload(s3_client, user_id, key):
+    if not key.startswith(upload_prefix(user_id)):
+        return False
+
+    try:
+        head = s3_client.head_object(Bucket=BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in MISSING_CODES:
+            return False
+        raise
+
+    return head.get('ContentType', '').startswith('image/')
+
+
+async def verify_uploads_async(s3_client, user_id, keys):
+    loop    = asyncio.get_running_loop()
+    results = await asyncio.gather(*[loop.run_in_executor(executor, verify_upload, s3_client, user_id, key) for key in keys])
+
+    return all(results)
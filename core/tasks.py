@@ -0,0 +1,96 @@
+import importlib, time, traceback
+
+from datetime         import timedelta
+
+from django.conf      import settings
+from django.db        import transaction
+from django.db.models import F
+from django.utils     import timezone
+
+from core.models      import Task
+
+
+registry = {}
+
+
+def task(name):
+    def register(func):
+        registry[name] = func
+        return func
+    return register
+
+
+def load_tasks():
+    for module in settings.TASK_MODULES:
+        importlib.import_module(module)
+
+
+def enqueue(name, **payload):
+    enqueue_many(name, [payload])
+
+
+def enqueue_many(name, payloads):
+    Task.objects.bulk_create([Task(name=name, payload=payload) for payload in payloads])
+
+
+def claim(batch_size):
+    now = timezone.now()
+
+    with transaction.atomic():
+        ready = Task.objects.filter(status__in=[Task.Status.PENDING, Task.Status.RUNNING], available_at__lte=now)
+
+        ready.filter(attempts__gte=settings.TASK_MAX_ATTEMPTS).update(
+            status    = Task.Status.DEAD,
+            error     = f'worker did not finish within {settings.TASK_VISIBILITY_TIMEOUT}s on the last attempt',
+            update_at = now
+        )
+        tasks = list(
+            ready.select_for_update(skip_locked=True)
+                 .filter(attempts__lt=settings.TASK_MAX_ATTEMPTS)
+                 .order_by('available_at', 'id')[:batch_size]
+        )
+        Task.objects.filter(id__in=[task.id for task in tasks]).update(
+            status       = Task.Status.RUNNING,
+            attempts     = F('attempts') + 1,
+            available_at = now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT)
+        )
+
+    for task in tasks:
+        task.attempts += 1
+
+    return tasks
+
+
+def execute(task):
+    claimed = Task.objects.filter(id=task.id, status=Task.Status.RUNNING, attempts=task.attempts)
+
+    try:
+        registry[task.name](**task.payload)
+    except Exception:
+        error = traceback.format_exc(limit=settings.TASK_TRACEBACK_LIMIT)
+        now   = timezone.now()
+
+        if task.attempts >= settings.TASK_MAX_ATTEMPTS:
+            claimed.update(status=Task.Status.DEAD, error=error, update_at=now)
+        else:
+            delay = settings.TASK_RETRY_BACKOFF * 2 ** (task.attempts - 1)
+            claimed.update(status=Task.Status.PENDING, error=error, available_at=now + timedelta(seconds=delay), update_at=now)
+
+        return False
+
+    claimed.delete()
+    return True
+
+
+def retry_dead(names=None):
+    dead = Task.objects.filter(status=Task.Status.DEAD)
+
+    if names:
+        dead = dead.filter(name__in=names)
+
+    return dead.update(status=Task.Status.PENDING, attempts=0, available_at=timezone.now(), update_at=timezone.now())
+
+
+@task('core.sleep')
+def sleep(ms=0):
+    time.sleep(ms / 1000)
@@ -1,3 +1,370 @@
-from django.test import TestCase
+import asyncio, json, jwt, os, tempfile, threading
 
-# Create your tests here.
+from datetime               import datetime, timedelta, timezone as dt_timezone
+from decimal                import Decimal
+
+from io                     import StringIO
+
+from django.conf            import settings
+from django.core.management import call_command
+from django.db              import connection, transaction
+from django.http            import HttpResponse, JsonResponse as DjangoJsonResponse
+from django.test            import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils           import timezone
+from unittest.mock          import MagicMock, patch
+
+from core                   import http, tasks
+from core.cache             import TTLCache, response_cache
+from core.models            import Task
+from core.ratelimit         import CacheCounters, acquire, local_counters, release
+from core.storage           import delete_files, delete_files_later
+from core.utils             import QueryCollector, database_sync_to_async
+from core.views             import AsyncView, PresignView
+from products.models        import Product
+from users.models           import User
+from my_settings            import SECRET_KEY, ALGORITHM
+
+
+class DeleteFilesTest(SimpleTestCase):
+    def test_delete_files_chunks(self):
+        s3_client = MagicMock()
+
+        delete_files(s3_client, [f'key{i}' for i in range(2500)] + [None])
+
+        batches = [call.kwargs['Delete']['Objects'] for call in s3_client.delete_objects.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [1000, 1000, 500])
+        self.assertEqual(s3_client.delete_object.call_count, 0)
+
+    def test_delete_files_empty(self):
+        s3_client = MagicMock()
+
+        delete_files(s3_client, [])
+
+        self.assertEqual(s3_client.delete_objects.call_count, 0)
+
+
+class TTLCacheTest(SimpleTestCase):
+    def test_ttl_cache_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch('core.cache.time.monotonic')
+    def test_ttl_cache_expires(self, mocked_monotonic):
+        cache = TTLCache(maxsize=2, ttl=60)
+        mocked_monotonic.return_value = 0
+        cache.set('a', 1)
+
+        mocked_monotonic.return_value = 61
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(len(cache), 0)
+
+
+class ExplainQueriesTest(TestCase):
+    def test_explain_queries_rolls_back(self):
+        stdout = StringIO()
+
+        call_command('explain_queries', sellers=2, products=2, reviews=1, stdout=stdout)
+
+        self.assertIn('GET /products/product -> 200', stdout.getvalue())
+        self.assertIn('full scans found', stdout.getvalue())
+        self.assertFalse(Product.objects.exists())
+
+
+class BenchmarkTest(TestCase):
+    def test_benchmark_writes_report(self):
+        stdout = StringIO()
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'report.json')
+            call_command('benchmark', sellers=2, products=2, reviews=1, requests=3, warmup=0, output=output, stdout=stdout)
+
+            with open(output) as f:
+                report = json.load(f)
+
+        self.assertEqual(report['dataset']['sellers'], 2)
+        self.assertEqual(report['endpoints']['product_list']['status'], 200)
+        self.assertEqual(report['endpoints']['purchase']['status'], 201)
+        self.assertEqual(report['endpoints']['kakao_login']['requests'], 3)
+        self.assertLessEqual(report['endpoints']['product_detail']['p50_ms'], report['endpoints']['product_detail']['p99_ms'])
+        self.assertIn('kakao_login', stdout.getvalue())
+
+
+class BenchProjectionTest(TestCase):
+    def test_bench_projection(self):
+        stdout = StringIO()
+
+        call_command('bench_projection', rows=20, repeat=1, stdout=stdout)
+
+        self.assertIn('product_list   projection     20', stdout.getvalue())
+        self.assertIn('recent_review  instances', stdout.getvalue())
+
+
+class QueryInstrumentationMiddlewareTest(TestCase):
+    def setUp(self):
+        response_cache().clear()
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+    def test_server_timing_and_log(self):
+        with self.assertLogs('gwapang.performance', level='INFO') as logs:
+            response = self.client.get('/products/seller?order_by=id')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['path'], '/products/seller')
+        self.assertEqual(line['status'], 200)
+        self.assertGreater(line['queries'], 0)
+        self.assertIsNotNone(line['slowest_sql'])
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+    async def test_server_timing_under_asgi(self):
+        response = await self.async_client.get('/products/seller?order_by=id')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        response = self.client.get('/products/seller?order_by=id')
+
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_collector_counts_queries(self):
+        collector = QueryCollector()
+
+        with connection.execute_wrapper(collector):
+            list(Product.objects.all())
+            Product.objects.count()
+
+        self.assertEqual(collector.count, 2)
+        self.assertIn('products', collector.slowest_sql)
+
+
+class SampleAsyncView(AsyncView):
+    async def get(self, request):
+        await asyncio.sleep(0)
+        return HttpResponse('async')
+
+    def post(self, request):
+        return HttpResponse('sync')
+
+
+class AsyncViewTest(SimpleTestCase):
+    async def test_dispatch(self):
+        view    = SampleAsyncView.as_view()
+        factory = RequestFactory()
+
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        self.assertIs(view.view_class, SampleAsyncView)
+
+        self.assertEqual((await view(factory.get('/'))).content, b'async')
+        self.assertEqual((await view(factory.post('/'))).content, b'sync')
+        self.assertEqual((await view(factory.delete('/'))).status_code, 405)
+
+    @override_settings(ASYNC_DB_THREAD_SENSITIVE=False)
+    @patch('core.utils.close_old_connections')
+    async def test_database_sync_to_async_thread_pool(self, mocked_close):
+        threads = set()
+
+        def work():
+            threads.add(threading.get_ident())
+
+        await asyncio.gather(*[database_sync_to_async(work)() for _ in range(4)])
+
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertEqual(mocked_close.call_count, 8)
+
+
+class PresignViewTest(TestCase):
+    def setUp(self):
+        self.user  = User.objects.create(kakao_account='presign', name='업로더', profile_image='')
+        self.token = jwt.encode({'id': self.user.id}, SECRET_KEY, algorithm=ALGORITHM)
+
+    def presign(self, body):
+        return self.client.post('/uploads/presign', json.dumps(body), content_type='application/json', HTTP_AUTHORIZATION=self.token)
+
+    @patch.object(PresignView, 's3_client')
+    def test_presign_success(self, mocked_s3_client):
+        mocked_s3_client.generate_presigned_post.return_value = {'url': 'https://bucket.s3.amazonaws.com', 'fields': {'key': 'k'}}
+
+        response = self.presign({'content_types': ['image/jpeg', 'image/png']})
+        uploads  = response.json()['uploads']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(uploads), 2)
+        self.assertTrue(all(upload['key'].startswith(f'uploads/{self.user.id}/') for upload in uploads))
+
+        kwargs = mocked_s3_client.generate_presigned_post.call_args.kwargs
+        self.assertEqual(kwargs['Key'], uploads[1]['key'])
+        self.assertEqual(kwargs['Fields'], {'Content-Type': 'image/png'})
+        self.assertIn(['content-length-range', 1, settings.S3_PRESIGN_MAX_SIZE], kwargs['Conditions'])
+
+    @patch.object(PresignView, 's3_client')
+    def test_presign_invalid(self, mocked_s3_client):
+        self.assertEqual(self.presign({'content_types': ['text/html']}).json(), {'MESSAGE': 'INVALID_CONTENT_TYPE'})
+        self.assertEqual(self.presign({'content_types': ['image/jpeg'] * (settings.S3_PRESIGN_MAX_FILES + 1)}).json(), {'MESSAGE': 'INVALID_FILE_COUNT'})
+        self.assertEqual(self.presign({}).json(), {'MESSAGE': 'KEY_ERROR'})
+        self.assertEqual(mocked_s3_client.generate_presigned_post.call_count, 0)
+
+
+class JsonResponseTest(SimpleTestCase):
+    data = {
+        'price'     : Decimal('12000.00'),
+        'create_at' : datetime(2021, 8, 23, 10, 0, 0, 123456, tzinfo=dt_timezone.utc),
+        'name'      : '망고',
+        'grades'    : {5: 2},
+        'images'    : ('a', 'b'),
+    }
+
+    def test_matches_django_json_response(self):
+        expected = json.loads(DjangoJsonResponse(self.data).content)
+
+        self.assertEqual(json.loads(http.JsonResponse(self.data).content), expected)
+        self.assertEqual(expected['create_at'], '2021-08-23T10:00:00.123Z')
+        self.assertEqual(expected['price'], '12000.00')
+
+    def test_fallback_without_orjson(self):
+        with patch('core.http.orjson', None):
+            response = http.JsonResponse(self.data, status=201)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), json.loads(DjangoJsonResponse(self.data).content))
+
+    def test_safe(self):
+        with self.assertRaises(TypeError):
+            http.JsonResponse([1])
+
+        self.assertEqual(http.JsonResponse([1], safe=False).content, b'[1]')
+
+    def test_bench_json(self):
+        stdout = StringIO()
+
+        call_command('bench_json', items=2, reviews=2, iterations=1, stdout=stdout)
+
+        self.assertIn('detail_page', stdout.getvalue())
+
+
+class RateLimitTest(SimpleTestCase):
+    def setUp(self):
+        local_counters.clear()
+
+    def test_sliding_window(self):
+        start = 1000 * 60
+
+        self.assertTrue(all(acquire('k', 3, 60, start + i)[0] for i in range(3)))
+
+        slot, retry_after = acquire('k', 3, 60, start + 10)
+        self.assertIsNone(slot)
+        self.assertEqual(retry_after, 50 + 20)
+
+        self.assertIsNone(acquire('k', 3, 60, start + 60 + 15)[0])
+        self.assertIsNotNone(acquire('k', 3, 60, start + 60 + 20)[0])
+
+    def test_release_returns_slot(self):
+        slot, _ = acquire('k', 1, 60, 0)
+        self.assertIsNone(acquire('k', 1, 60, 1)[0])
+
+        release(slot)
+        self.assertIsNotNone(acquire('k', 1, 60, 2)[0])
+
+    @override_settings(RATE_LIMIT_ALIAS='default')
+    def test_cache_backend(self):
+        response_cache().clear()
+
+        self.assertIsNotNone(acquire('k', 1, 60, 0)[0])
+        self.assertIsNone(acquire('k', 1, 60, 1)[0])
+        self.assertEqual(CacheCounters(response_cache()).get('k:0'), 1)
+        self.assertEqual(local_counters.get('k:0'), 0)
+
+
+@tasks.task('tests.fail')
+def fail(message):
+    raise ValueError(message)
+
+
+@override_settings(TASK_MAX_ATTEMPTS=2, TASK_RETRY_BACKOFF=10, TASK_VISIBILITY_TIMEOUT=60)
+class TaskQueueTest(TestCase):
+    def run_tasks(self):
+        call_command('run_tasks', concurrency=0, once=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_claim_hides_task_until_visibility_timeout(self):
+        tasks.enqueue('core.sleep', ms=0)
+
+        claimed = tasks.claim(10)
+
+        self.assertEqual([(task.name, task.attempts) for task in claimed], [('core.sleep', 1)])
+        self.assertEqual(tasks.claim(10), [])
+
+        Task.objects.update(available_at=timezone.now())
+        reclaimed = tasks.claim(10)
+
+        self.assertEqual(reclaimed[0].attempts, 2)
+
+        tasks.execute(claimed[0])
+        self.assertTrue(Task.objects.filter(status=Task.Status.RUNNING, attempts=2).exists())
+
+        tasks.execute(reclaimed[0])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_task_backs_off_then_dies(self):
+        tasks.enqueue('tests.fail', message='boom')
+
+        self.run_tasks()
+        task = Task.objects.get()
+
+        self.assertEqual((task.status, task.attempts), (Task.Status.PENDING, 1))
+        self.assertIn('ValueError: boom', task.error)
+        self.assertGreater(task.available_at, timezone.now() + timedelta(seconds=5))
+
+        Task.objects.update(available_at=timezone.now())
+        self.run_tasks()
+
+        self.assertEqual(Task.objects.get().status, Task.Status.DEAD)
+
+        self.run_tasks()
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+        call_command('run_tasks', retry_dead=['tests.fail'], stdout=StringIO())
+        task = Task.objects.get()
+
+        self.assertEqual((task.status, task.attempts), (Task.Status.PENDING, 0))
+
+    def test_task_that_kills_its_worker_dies(self):
+        tasks.enqueue('core.sleep', ms=0)
+
+        for attempt in (1, 2):
+            self.assertEqual([task.attempts for task in tasks.claim(10)], [attempt])
+            Task.objects.update(available_at=timezone.now())
+
+        self.assertEqual(tasks.claim(10), [])
+
+        task = Task.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task.Status.DEAD, 2))
+        self.assertIn('did not finish', task.error)
+
+    def test_delete_files_later_rolls_back_with_transaction(self):
+        with transaction.atomic():
+            delete_files_later(['a', None, 'b'])
+            transaction.set_rollback(True)
+
+        self.assertFalse(Task.objects.exists())
+
+        delete_files_later(['a', None, 'b'])
+        self.assertEqual(Task.objects.get().payload, {'keys': ['a', 'b']})
+
+    def test_bench_tasks(self):
+        stdout = StringIO()
+
+        call_command('bench_tasks', tasks=5, ms=0, concurrency=[0], stdout=stdout)
+
+        self.assertIn('tasks/s', stdout.getvalue())
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from core.views  import PresignView
+
+urlpatterns = [
+    path('/presign', PresignView.as_view()),
+]
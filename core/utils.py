@@ -1,21 +1,59 @@
 import functools, time
-from django.db   import connection, reset_queries
-from django.conf import settings
+
+from asgiref.sync import sync_to_async
+from django.conf  import settings
+from django.db    import close_old_connections, connection
+
+
+class QueryCollector:
+    def __init__(self):
+        self.count            = 0
+        self.duration         = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql      = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed        = time.perf_counter() - start
+            self.count    += 1
+            self.duration += elapsed
+
+            if elapsed >= self.slowest_duration:
+                self.slowest_duration = elapsed
+                self.slowest_sql      = sql
 
 
 def query_debugger(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        reset_queries()
-        number_of_start_queries = len(connection.queries)
-        start  = time.perf_counter()
-        result = func(*args, **kwargs)
-        end    = time.perf_counter()
-        number_of_end_queries = len(connection.queries)
+        collector = QueryCollector()
+        start     = time.perf_counter()
+        with connection.execute_wrapper(collector):
+            result = func(*args, **kwargs)
+        end       = time.perf_counter()
         print(f"-------------------------------------------------------------------")
         print(f"Function : {func.__name__}")
-        print(f"Number of Queries : {number_of_end_queries-number_of_start_queries}")
+        print(f"Number of Queries : {collector.count}")
         print(f"Finished in : {(end - start):.2f}s")
         print(f"-------------------------------------------------------------------")
         return result
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def database_sync_to_async(func):
+    thread_sensitive = settings.ASYNC_DB_THREAD_SENSITIVE
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not thread_sensitive:
+            close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if not thread_sensitive:
+                close_old_connections()
+
+    return sync_to_async(wrapper, thread_sensitive=thread_sensitive)
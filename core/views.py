@@ -1,3 +1,60 @@
-from django.shortcuts import render
+import asyncio, boto3, functools, json
 
-# Create your views here.
+from core.utils    import database_sync_to_async
+from django.conf   import settings
+from django.views  import View
+
+from core.http     import JsonResponse
+from core.storage  import presign_upload
+from users.utils   import login
+from my_settings   import ACCESS_KEY_ID, SECRET_ACESS_KEY
+
+
+class AsyncView(View):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        functools.update_wrapper(async_view, view)
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() in self.http_method_names:
+            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+
+        if asyncio.iscoroutinefunction(handler):
+            return await handler(request, *args, **kwargs)
+
+        return await database_sync_to_async(handler)(request, *args, **kwargs)
+
+
+class PresignView(View):
+    s3_client = boto3.client(
+        's3',
+        aws_access_key_id     = ACCESS_KEY_ID,
+        aws_secret_access_key = SECRET_ACESS_KEY,
+    )
+
+    @login
+    def post(self, request):
+        try:
+            data          = json.loads(request.body)
+            content_types = data['content_types']
+
+            if not content_types or len(content_types) > settings.S3_PRESIGN_MAX_FILES:
+                return JsonResponse({"MESSAGE": "INVALID_FILE_COUNT"}, status=400)
+
+            if not all(isinstance(content_type, str) and content_type.startswith('image/') for content_type in content_types):
+                return JsonResponse({"MESSAGE": "INVALID_CONTENT_TYPE"}, status=400)
+
+            uploads = [presign_upload(self.s3_client, request.user.id, content_type) for content_type in content_types]
+
+            return JsonResponse({"MESSAGE": "SUCCESS", "uploads": uploads}, status=200)
+
+        except (KeyError, TypeError, json.JSONDecodeError):
+            return JsonResponse({"MESSAGE": "KEY_ERROR"}, status=400)
@@ -40,12 +40,14 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'corsheaders',
+    'core',
     'users',
     'products',
     'reviews',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -161,3 +163,106 @@ AWS_QUERYSTRING_AUTH = False
 AWS_S3_ACCESS_KEY_ID = ACCESS_KEY_ID
 AWS_S3_SECRET_ACCESS_KEY = SECRET_ACESS_KEY
 AWS_STORAGE_BUCKET_NAME = BUCKET_NAME
+
+##SEARCH
+SEARCH_RESULT_LIMIT = 100
+
+##PAGINATION
+PAGE_SIZE     = 10
+MAX_PAGE_SIZE = 50
+
+##S3
+S3_UPLOAD_WORKERS = 8
+
+S3_UPLOAD_PREFIX     = 'uploads'
+S3_PRESIGN_EXPIRES   = 600
+S3_PRESIGN_MAX_SIZE  = 10 * 1024 * 1024
+S3_PRESIGN_MAX_FILES = 10
+
+##USER_CACHE
+USER_CACHE_ALIAS = None
+USER_CACHE_SIZE  = 10000
+USER_CACHE_TTL   = 60
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL  = 300
+
+##CACHE
+CACHES = {
+    'default': {
+        'BACKEND' : 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS' : {
+            'MAX_ENTRIES' : 10000,
+        },
+    },
+}
+
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TTL   = {
+    'search'          : 30,
+    'seller_list'     : 60,
+    'seller_products' : 30,
+    'product_list'    : 30,
+    'recent_review'   : 10,
+}
+
+##RATE_LIMIT
+RATE_LIMIT_ALIAS = None
+RATE_LIMIT_SIZE  = 10000
+RATE_LIMITS      = {
+    'product_upload' : (4, 60 * 60 * 24),
+    'review_post'    : (20, 60 * 60),
+    'purchase'       : (30, 60),
+}
+
+##RECENT_REVIEW
+RECENT_REVIEW_BUFFER_SIZE = 0
+RECENT_REVIEW_BUFFER_TTL  = 60
+
+##PERFORMANCE
+PERFORMANCE_SAMPLE_RATE = 0.1
+
+LOGGING = {
+    'version'                  : 1,
+    'disable_existing_loggers' : False,
+    'handlers'                 : {
+        'console' : {
+            'class' : 'logging.StreamHandler',
+        },
+    },
+    'loggers' : {
+        'gwapang.performance' : {
+            'handlers'  : ['console'],
+            'level'     : 'INFO',
+            'propagate' : False,
+        },
+    },
+}
+
+##KAKAO
+KAKAO_API_URL = 'https://kapi.kakao.com/v2/user/me'
+KAKAO_TIMEOUT = 5
+KAKAO_RETRIES = 2
+KAKAO_BACKOFF = 0.2
+
+KAKAO_MAX_CONNECTIONS    = 20
+KAKAO_PROFILE_CACHE_SIZE = 10000
+KAKAO_PROFILE_CACHE_TTL  = 10
+
+##IMAGE
+IMAGE_VARIANTS         = (('list', 320), ('detail', 800), ('full', 1600))
+IMAGE_VARIANT_FORMATS  = ('webp', 'jpeg')
+IMAGE_VARIANT_QUALITY  = 80
+IMAGE_LIST_SIZE        = 320
+
+##TASKS
+TASK_MODULES            = ('core.storage', 'products.images')
+TASK_CONCURRENCY        = 4
+TASK_BATCH_SIZE         = 20
+TASK_MAX_ATTEMPTS       = 5
+TASK_RETRY_BACKOFF      = 10
+TASK_VISIBILITY_TIMEOUT = 300
+TASK_TRACEBACK_LIMIT    = 5
+
+##ASYNC
+ASYNC_DB_THREAD_SENSITIVE = False
+TEST_RUNNER               = 'core.runner.TestRunner'
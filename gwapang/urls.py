@@ -18,5 +18,6 @@ from django.urls import path, include
 urlpatterns = [
         path('users', include('users.urls')),
         path('products', include('products.urls')),
-        path('reviews', include('reviews.urls'))
+        path('reviews', include('reviews.urls')),
+        path('uploads', include('core.urls'))
 ]
@@ -0,0 +1,124 @@
+from io                  import BytesIO
+
+from django.conf         import settings
+from django.db           import transaction
+from PIL                 import Image as PILImage, ImageOps
+
+from core.cache          import invalidate_tags
+from core.models         import Task
+from core.storage        import delete_files_later, s3_client
+from core.tasks          import enqueue_many, task
+from products.models     import Product, Image, ImageVariant
+from reviews.models      import Review
+from my_settings         import BUCKET_NAME, AWS_S3_URL
+
+
+CONTENT_TYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+EXTENSIONS    = {'webp': 'webp', 'jpeg': 'jpg'}
+
+
+def variant_key(source_key, name, format):
+    return f'variants/{source_key}/{name}.{EXTENSIONS[format]}'
+
+
+def render_variants(data):
+    with PILImage.open(BytesIO(data)) as original:
+        original = ImageOps.exif_transpose(original).convert('RGB')
+
+        for name, size in settings.IMAGE_VARIANTS:
+            image = original.copy()
+            image.thumbnail((size, size), PILImage.LANCZOS)
+
+            for format in settings.IMAGE_VARIANT_FORMATS:
+                buffer = BytesIO()
+                image.save(buffer, format.upper(), quality=settings.IMAGE_VARIANT_QUALITY)
+                yield name, format, buffer.getvalue(), image.width, image.height
+
+
+def process_image(client, source_key):
+    data     = client.get_object(Bucket=BUCKET_NAME, Key=source_key)['Body'].read()
+    variants = []
+
+    for name, format, content, width, height in render_variants(data):
+        key = variant_key(source_key, name, format)
+        client.put_object(
+            Bucket       = BUCKET_NAME,
+            Key          = key,
+            Body         = content,
+            ContentType  = CONTENT_TYPES[format],
+            CacheControl = 'max-age=31536000, immutable'
+        )
+        variants.append({
+            'source_key' : source_key,
+            'name'       : name,
+            'format'     : format,
+            'key'        : key,
+            'url'        : f'{AWS_S3_URL}/{key}',
+            'width'      : width,
+            'height'     : height,
+            'size'       : len(content),
+        })
+
+    return variants
+
+
+def fitting_variant(variants, size, format=None):
+    format   = format or settings.IMAGE_VARIANT_FORMATS[0]
+    variants = sorted((variant for variant in variants if variant.format == format), key=lambda variant: variant.width * variant.height)
+    fitting  = [variant for variant in variants if max(variant.width, variant.height) >= size]
+
+    return (fitting or variants[-1:] or [None])[0]
+
+
+def save_variants(source_key, variants):
+    variants = [ImageVariant(**variant) for variant in variants]
+
+    with transaction.atomic():
+        ImageVariant.objects.filter(source_key=source_key).delete()
+        ImageVariant.objects.bulk_create(variants)
+
+        thumbnail = fitting_variant(variants, settings.IMAGE_LIST_SIZE)
+
+        if thumbnail:
+            products = list(
+                Product.objects.filter(image__image_uuid=source_key, image__is_thumbnail=True).values_list('id', 'user_id')
+            )
+            sellers  = [user_id for _, user_id in products]
+
+            Product.objects.filter(id__in=[product_id for product_id, _ in products]).update(thumbnail=thumbnail.url)
+            Review.objects.filter(image_uuid=source_key).update(thumbnail=thumbnail.url)
+
+            invalidate_tags('products', 'sellers', 'reviews', *[f'seller:{user_id}' for user_id in sellers])
+
+
+@task('products.process_image')
+def process_image_task(source_key):
+    if not (Image.objects.filter(image_uuid=source_key).exists() or Review.objects.filter(image_uuid=source_key).exists()):
+        return
+
+    save_variants(source_key, process_image(s3_client(), source_key))
+
+
+def enqueue_images(keys):
+    enqueue_many('products.process_image', [{'source_key': key} for key in keys if key])
+
+
+def enqueue_missing():
+    keys = set(Image.objects.exclude(image_uuid=None).values_list('image_uuid', flat=True))
+    keys.update(Review.objects.exclude(image_uuid=None).values_list('image_uuid', flat=True))
+    keys.difference_update(ImageVariant.objects.values_list('source_key', flat=True))
+    keys.difference_update(
+        payload['source_key'] for payload in Task.objects.filter(name='products.process_image')
+                                                         .exclude(status=Task.Status.DEAD)
+                                                         .values_list('payload', flat=True)
+    )
+
+    enqueue_images(sorted(keys))
+    return len(keys)
+
+
+def discard_images(keys):
+    keys = list(keys)
+
+    delete_files_later(keys + list(ImageVariant.objects.filter(source_key__in=keys).values_list('key', flat=True)))
+    ImageVariant.objects.filter(source_key__in=keys).delete()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from products.models             import Product, Image
+
+
+class Command(BaseCommand):
+    help = 'Copy each product\'s thumbnail image URL onto products.thumbnail in id-ordered batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id    = 0
+        updated    = 0
+
+        while True:
+            products = list(
+                Product.objects.filter(id__gt=last_id, thumbnail=None).order_by('id').only('id', 'thumbnail')[:batch_size]
+            )
+
+            if not products:
+                break
+
+            thumbnails = dict(
+                Image.objects.filter(product_id__in=[product.id for product in products], is_thumbnail=True)
+                             .order_by('-id')
+                             .values_list('product_id', 'url')
+            )
+
+            for product in products:
+                product.thumbnail = thumbnails.get(product.id)
+
+            filled   = [product for product in products if product.thumbnail]
+            last_id  = products[-1].id
+            updated += len(filled)
+
+            Product.objects.bulk_update(filled, ['thumbnail'])
+
+            self.stdout.write(f"backfilled up to product {last_id}")
+
+        self.stdout.write(self.style.SUCCESS(f"backfilled {updated} products"))
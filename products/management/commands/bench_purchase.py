@@ -0,0 +1,84 @@
+import threading, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection, DatabaseError
+from django.db.models            import Sum
+
+from products.models             import Product, Order
+from products.purchase           import PurchaseError, purchase
+from users.models                import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer a single product with concurrent buyers and verify that stock never oversells. '
+        'Run against MySQL; SQLite serializes writers and only reports lock errors.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=50, help='purchase attempts per thread')
+        parser.add_argument('--stock', type=int, default=500)
+        parser.add_argument('--quantity', type=int, default=1)
+
+    def handle(self, *args, **options):
+        threads, attempts, stock, quantity = options['threads'], options['attempts'], options['stock'], options['quantity']
+
+        seller  = User.objects.create(kakao_account='bench-seller', name='bench-seller', profile_image='', point=0)
+        buyers  = [
+            User.objects.create(kakao_account=f'bench-buyer-{i}', name=f'bench-buyer-{i}', profile_image='', point=10**9)
+            for i in range(threads)
+        ]
+        product = Product.objects.create(user_id=seller.id, name='bench', price=1000, description='', stock=stock)
+
+        counts = {'sold': 0, 'out_of_stock': 0, 'errors': 0}
+        lock   = threading.Lock()
+
+        def buy(buyer_id):
+            result = {'sold': 0, 'out_of_stock': 0, 'errors': 0}
+            try:
+                for _ in range(attempts):
+                    try:
+                        purchase(buyer_id, product.id, quantity)
+                        result['sold'] += quantity
+                    except PurchaseError:
+                        result['out_of_stock'] += 1
+                    except DatabaseError:
+                        result['errors'] += 1
+            finally:
+                connection.close()
+
+            with lock:
+                for key, value in result.items():
+                    counts[key] += value
+
+        workers = [threading.Thread(target=buy, args=(buyer.id,)) for buyer in buyers]
+        start   = time.perf_counter()
+
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        elapsed = time.perf_counter() - start
+
+        try:
+            product.refresh_from_db()
+            ordered = Order.objects.filter(product_id=product.id).aggregate(total=Sum('quantity'))['total'] or 0
+            total   = threads * attempts
+
+            self.stdout.write(f"attempts      : {total}")
+            self.stdout.write(f"sold          : {counts['sold']} / stock {stock}")
+            self.stdout.write(f"rejected      : {counts['out_of_stock']}")
+            self.stdout.write(f"db errors     : {counts['errors']}")
+            self.stdout.write(f"elapsed       : {elapsed:.3f}s")
+            self.stdout.write(f"throughput    : {total / elapsed:.1f} attempts/s, {counts['sold'] / quantity / elapsed:.1f} orders/s")
+
+            if product.stock < 0 or ordered != counts['sold'] or product.stock != stock - ordered or product.ordered_quantity != ordered:
+                raise CommandError(f"inconsistent state: stock={product.stock} ordered={ordered} ordered_quantity={product.ordered_quantity}")
+
+            self.stdout.write(self.style.SUCCESS('no overselling detected'))
+
+        finally:
+            product.delete()
+            User.objects.filter(id__in=[seller.id] + [buyer.id for buyer in buyers]).delete()
@@ -0,0 +1,71 @@
+import statistics, time
+
+from django.core.management.base import BaseCommand
+from django.db                   import transaction
+from django.db.models            import Exists, OuterRef, Prefetch
+
+from products.models             import Origin, Product
+from users.models                import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the SellerListView category query (EXISTS semi-join) against the old join + DISTINCT + prefetch '
+        'over a grid of sellers x products per seller. Seed data is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', type=int, nargs='+', default=[100, 1000])
+        parser.add_argument('--products', type=int, nargs='+', default=[1, 10], help='products per seller')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def old_query(self):
+        return list(
+            User.objects.filter(product__origin_id=1).prefetch_related(
+                Prefetch('product_set', queryset=Product.objects.filter(origin_id=1), to_attr='category')
+            ).order_by('id').distinct()
+        )
+
+    def new_query(self):
+        return list(
+            User.objects.filter(Exists(Product.objects.filter(user_id=OuterRef('id'), origin_id=1))).order_by('id')
+        )
+
+    def measure(self, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def seed(self, sellers, products):
+        prefix = f'bench-{sellers}-{products}'
+        Origin.objects.get_or_create(id=1, defaults={'name': Origin.Type.DOMESTIC})
+        User.objects.bulk_create(
+            [User(kakao_account=f'{prefix}-{i}', name=f'{prefix}-{i}', profile_image='') for i in range(sellers)],
+            batch_size = 1000
+        )
+        user_ids = User.objects.filter(kakao_account__startswith=prefix).values_list('id', flat=True)
+        Product.objects.bulk_create(
+            [
+                Product(user_id=user_id, name='bench', price=1000, description='', stock=1, origin_id=None if i % 2 else 1)
+                for user_id in user_ids for i in range(products)
+            ],
+            batch_size = 1000
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'sellers':>8} {'products':>9} {'old ms':>9} {'exists ms':>10} {'speedup':>8}")
+
+        for sellers in options['sellers']:
+            for products in options['products']:
+                with transaction.atomic():
+                    self.seed(sellers, products)
+
+                    old = self.measure(self.old_query, options['repeat'])
+                    new = self.measure(self.new_query, options['repeat'])
+
+                    transaction.set_rollback(True)
+
+                self.stdout.write(f"{sellers:>8} {sellers * products:>9} {old:>9.2f} {new:>10.2f} {old / new:>7.1f}x")
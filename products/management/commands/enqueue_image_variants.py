@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from products.images             import enqueue_missing
+
+
+class Command(BaseCommand):
+    help = 'Queue a products.process_image task for every product and review image that has no variants yet.'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f"queued {enqueue_missing()} images"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from products.search             import rebuild_index
+from products.models             import SearchToken, SellerToken
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the n-gram search index for products and sellers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        rebuild_index(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"indexed {SearchToken.objects.count()} product tokens, {SellerToken.objects.count()} seller tokens"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from products.models             import SellerStat
+from products.stats              import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the seller_stats leaderboard table from products.ordered_quantity'
+
+    def handle(self, *args, **options):
+        rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"refreshed {SellerStat.objects.count()} seller stats"))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_search_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='thumbnail',
+            field=models.CharField(max_length=200, null=True),
+        ),
+    ]
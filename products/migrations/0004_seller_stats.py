@@ -0,0 +1,35 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('products', '0003_product_thumbnail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(default='', max_length=20)),
+                ('total_ordered', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.user')),
+            ],
+            options={
+                'db_table': 'seller_stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='sellerstat',
+            index=models.Index(fields=['category', '-total_ordered', 'user'], name='seller_stat_categor_2cd79d_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='sellerstat',
+            unique_together={('user', 'category')},
+        ),
+    ]
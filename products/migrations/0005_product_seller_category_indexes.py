@@ -0,0 +1,21 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_seller_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'origin'], name='products_user_id_a20106_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'storage'], name='products_user_id_e84e0d_idx'),
+        ),
+    ]
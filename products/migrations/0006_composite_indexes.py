@@ -0,0 +1,21 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_product_seller_category_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['product', 'is_thumbnail'], name='images_product_82bc65_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'product'], name='orders_user_id_32fc11_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['image_uuid'], name='images_image_u_9133d7_idx'),
+        ),
+    ]
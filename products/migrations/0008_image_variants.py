@@ -0,0 +1,31 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_image_uuid_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_key', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=10)),
+                ('format', models.CharField(max_length=10)),
+                ('key', models.CharField(max_length=200)),
+                ('url', models.CharField(max_length=300)),
+                ('width', models.IntegerField()),
+                ('height', models.IntegerField()),
+                ('size', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'image_variants',
+                'unique_together': {('source_key', 'name', 'format')},
+            },
+        ),
+    ]
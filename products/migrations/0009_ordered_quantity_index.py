@@ -0,0 +1,17 @@
+# Generated by Django 3.2.6 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['ordered_quantity', 'id'], name='products_ordered_366979_idx'),
+        ),
+    ]
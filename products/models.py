@@ -33,10 +33,16 @@ class Product(models.Model):
     ordered_quantity = models.IntegerField(default=0)
     description      = models.TextField()
     stock            = models.IntegerField()
+    thumbnail        = models.CharField(max_length=200, null=True)
     create_at        = models.DateField(auto_now=True)
 
     class Meta:
         db_table = 'products'
+        indexes  = [
+            models.Index(fields=['user', 'origin']),
+            models.Index(fields=['user', 'storage']),
+            models.Index(fields=['ordered_quantity', 'id']),
+        ]
 
 
 class Image(models.Model):
@@ -48,6 +54,10 @@ class Image(models.Model):
 
     class Meta:
         db_table = 'images'
+        indexes  = [
+            models.Index(fields=['product', 'is_thumbnail']),
+            models.Index(fields=['image_uuid']),
+        ]
 
 
 class Order(models.Model):
@@ -57,4 +67,54 @@ class Order(models.Model):
 
     class Meta:
         db_table = 'orders'
+        indexes  = [
+            models.Index(fields=['user', 'product']),
+        ]
+
+
+class SearchToken(models.Model):
+    product = models.ForeignKey("Product", on_delete=models.CASCADE)
+    token   = models.CharField(max_length=10)
+    weight  = models.IntegerField(default=1)
+
+    class Meta:
+        db_table        = 'search_tokens'
+        unique_together = ('token', 'product')
+
+
+class SellerToken(models.Model):
+    user  = models.ForeignKey("users.User", on_delete=models.CASCADE)
+    token = models.CharField(max_length=10)
+
+    class Meta:
+        db_table        = 'seller_tokens'
+        unique_together = ('token', 'user')
+
+
+class SellerStat(models.Model):
+    user          = models.ForeignKey("users.User", on_delete=models.CASCADE)
+    category      = models.CharField(max_length=20, default='')
+    total_ordered = models.IntegerField(default=0)
+
+    class Meta:
+        db_table        = 'seller_stats'
+        unique_together = ('user', 'category')
+        indexes         = [
+            models.Index(fields=['category', '-total_ordered', 'user']),
+        ]
+
+
+class ImageVariant(models.Model):
+    source_key = models.CharField(max_length=100)
+    name       = models.CharField(max_length=10)
+    format     = models.CharField(max_length=10)
+    key        = models.CharField(max_length=200)
+    url        = models.CharField(max_length=300)
+    width      = models.IntegerField()
+    height     = models.IntegerField()
+    size       = models.IntegerField()
+
+    class Meta:
+        db_table        = 'image_variants'
+        unique_together = ('source_key', 'name', 'format')
 
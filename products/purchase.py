@@ -0,0 +1,83 @@
+import math
+
+from collections      import defaultdict
+
+from django.db        import transaction
+from django.db.models import Case, When, F, Q
+
+from core.cache       import invalidate_tags
+from products.models  import Product, Order
+from products.stats   import add_sales
+from users.models     import User
+from users.utils      import invalidate_user
+
+
+class PurchaseError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status  = status
+
+
+def cart_quantities(items):
+    quantities = defaultdict(int)
+
+    for product_id, quantity in items:
+        if type(product_id) is not int:
+            raise PurchaseError('INVALID_PRODUCT')
+
+        if type(quantity) is not int or quantity < 1:
+            raise PurchaseError('INVALID_QUANTITY')
+
+        quantities[product_id] += quantity
+
+    if not quantities:
+        raise PurchaseError('EMPTY_CART')
+
+    return quantities
+
+
+def checkout(buyer_id, items):
+    quantities = cart_quantities(items)
+
+    with transaction.atomic():
+        products = list(
+            Product.objects.select_for_update().filter(id__in=quantities).order_by('id').only('id', 'user_id', 'origin_id', 'storage_id', 'price')
+        )
+
+        if len(products) != len(quantities):
+            raise PurchaseError('NO_PRODUCT', 404)
+
+        total_price = math.ceil(sum(product.price * quantities[product.id] for product in products))
+        in_stock    = Q()
+
+        for product_id, quantity in quantities.items():
+            in_stock |= Q(id=product_id, stock__gte=quantity)
+
+        if Product.objects.filter(in_stock).update(
+            stock            = Case(*[When(id=product_id, then=F('stock') - quantity) for product_id, quantity in quantities.items()]),
+            ordered_quantity = Case(*[When(id=product_id, then=F('ordered_quantity') + quantity) for product_id, quantity in quantities.items()])
+        ) != len(quantities):
+            raise PurchaseError('OUT_OF_STOCK')
+
+        if not User.objects.filter(id=buyer_id, point__gte=total_price).update(point=F('point') - total_price):
+            raise PurchaseError('INSUFFICIENT_POINTS')
+
+        orders = Order.objects.bulk_create([
+            Order(
+                user_id    = buyer_id,
+                product_id = product.id,
+                quantity   = quantities[product.id]
+            ) for product in products
+        ])
+
+        add_sales([(product, quantities[product.id]) for product in products])
+
+        invalidate_tags('products', 'sellers', *{f'seller:{product.user_id}' for product in products})
+        transaction.on_commit(lambda: invalidate_user(buyer_id))
+
+    return orders
+
+
+def purchase(buyer_id, product_id, quantity):
+    return checkout(buyer_id, [(product_id, quantity)])[0]
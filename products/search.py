@@ -0,0 +1,114 @@
+import re
+
+from collections      import defaultdict
+
+from django.conf      import settings
+from django.db.models import Count, Sum
+
+from products.models  import Product, SearchToken, SellerToken
+from users.models     import User
+
+
+NGRAM_SIZE    = 2
+FIELD_WEIGHTS = {
+    'name'        : 5,
+    'seller'      : 3,
+    'description' : 1,
+}
+
+
+def _words(text):
+    return [word for word in re.split(r'[\W_]+', (text or '').lower()) if word]
+
+
+def tokenize(text):
+    grams = set()
+
+    for word in _words(text):
+        grams.update(word)
+        grams.update(word[i:i+NGRAM_SIZE] for i in range(len(word)-NGRAM_SIZE+1))
+
+    return grams
+
+
+def query_tokens(keyword):
+    grams = set()
+
+    for word in _words(keyword):
+        if len(word) < NGRAM_SIZE:
+            grams.add(word)
+        else:
+            grams.update(word[i:i+NGRAM_SIZE] for i in range(len(word)-NGRAM_SIZE+1))
+
+    return grams
+
+
+def product_tokens(product, seller_name):
+    weights = defaultdict(int)
+
+    for field, text in (('name', product.name), ('seller', seller_name), ('description', product.description)):
+        for token in tokenize(text):
+            weights[token] += FIELD_WEIGHTS[field]
+
+    return [SearchToken(product_id=product.id, token=token, weight=weight) for token, weight in weights.items()]
+
+
+def seller_tokens(user):
+    return [SellerToken(user_id=user.id, token=token) for token in tokenize(user.name)]
+
+
+def index_product(product, seller_name=None):
+    if seller_name is None:
+        seller_name = User.objects.values_list('name', flat=True).get(id=product.user_id)
+
+    SearchToken.objects.filter(product_id=product.id).delete()
+    SearchToken.objects.bulk_create(product_tokens(product, seller_name))
+
+
+def index_seller(user):
+    SellerToken.objects.filter(user_id=user.id).delete()
+    SellerToken.objects.bulk_create(seller_tokens(user))
+
+
+def rebuild_index(batch_size=500):
+    SearchToken.objects.all().delete()
+    SellerToken.objects.all().delete()
+
+    for user in User.objects.only('id', 'name').iterator(chunk_size=batch_size):
+        index_seller(user)
+
+    products = Product.objects.select_related('user').only('id', 'name', 'description', 'user__name')
+    for product in products.iterator(chunk_size=batch_size):
+        index_product(product, product.user.name)
+
+
+def search_products(keyword):
+    tokens = query_tokens(keyword)
+
+    if not tokens:
+        return []
+
+    return list(
+        SearchToken.objects.filter(token__in=tokens)
+                           .values('product_id')
+                           .annotate(hits=Count('id'), score=Sum('weight'))
+                           .filter(hits=len(tokens))
+                           .order_by('-score', '-product_id')
+                           .values_list('product_id', flat=True)[:settings.SEARCH_RESULT_LIMIT]
+    )
+
+
+def search_sellers(keyword):
+    tokens = query_tokens(keyword)
+
+    if not tokens:
+        return []
+
+    return list(
+        SellerToken.objects.filter(token__in=tokens)
+                           .values('user_id')
+                           .annotate(hits=Count('id'))
+                           .filter(hits=len(tokens))
+                           .order_by('user_id')
+                           .values_list('user_id', flat=True)[:settings.SEARCH_RESULT_LIMIT]
+    )
@@ -0,0 +1,77 @@
+from collections      import defaultdict
+
+from django.db        import transaction
+from django.db.models import Case, When, F, Q, Sum
+
+from products.models  import Origin, Storage, Product, SellerStat
+from users.models     import User
+
+
+ALL = ''
+
+
+def categories(origin_id, storage_id):
+    names      = [ALL]
+    origin_id  = int(origin_id) if str(origin_id).isdigit() else None
+    storage_id = int(storage_id) if str(storage_id).isdigit() else None
+
+    if origin_id in Origin.Type.values:
+        names.append(Origin.Type(origin_id).name)
+
+    if storage_id in Storage.Type.values:
+        names.append(Storage.Type(storage_id).name)
+
+    return names
+
+
+def add_sales(sales):
+    increments = defaultdict(int)
+
+    for product, quantity in sales:
+        for category in categories(product.origin_id, product.storage_id):
+            increments[(product.user_id, category)] += quantity
+
+    if not increments:
+        return
+
+    SellerStat.objects.bulk_create(
+        [SellerStat(user_id=user_id, category=category) for user_id, category in increments],
+        ignore_conflicts = True
+    )
+
+    rows = Q()
+    for user_id, category in increments:
+        rows |= Q(user_id=user_id, category=category)
+
+    SellerStat.objects.filter(rows).update(total_ordered=Case(*[
+        When(user_id=user_id, category=category, then=F('total_ordered') + quantity)
+        for (user_id, category), quantity in increments.items()
+    ]))
+
+
+def add_product(product):
+    add_sales([(product, 0)])
+
+
+def remove_products(products):
+    products = products.only('user_id', 'origin_id', 'storage_id', 'ordered_quantity')
+    add_sales([(product, -product.ordered_quantity) for product in products])
+
+
+def rebuild():
+    totals = defaultdict(int)
+
+    for row in Product.objects.values('user_id', 'origin_id', 'storage_id').annotate(total=Sum('ordered_quantity')):
+        for category in categories(row['origin_id'], row['storage_id']):
+            totals[(row['user_id'], category)] += row['total']
+
+    with transaction.atomic():
+        SellerStat.objects.all().delete()
+        SellerStat.objects.bulk_create(
+            [SellerStat(user_id=user_id, category=category, total_ordered=total) for (user_id, category), total in totals.items()],
+            batch_size = 1000
+        )
+
+
+def leaderboard(category=ALL, limit=10):
+    return User.objects.filter(sellerstat__category=category).order_by('-sellerstat__total_ordered', 'id')[:limit]
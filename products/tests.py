@@ -1,11 +1,25 @@
 import json, jwt
 
-from django.test                    import TestCase, Client
+from io                             import BytesIO, StringIO
+from django.core.management         import call_command
+from django.db                      import connection
+from django.test                    import TestCase, Client, override_settings
+from django.test.utils              import CaptureQueriesContext
 from django.core.files.uploadedfile import SimpleUploadedFile
 from unittest.mock                  import MagicMock, patch
+from botocore.exceptions            import ClientError
+from PIL                            import Image as PILImage
 
 from reviews.models                 import Review
-from products.models                import Origin, Storage, Product, Image, Order
+from products.models                import Origin, Storage, Product, Image, Order, SellerStat, ImageVariant
+from products.images                import enqueue_images
+from products.search                import rebuild_index
+from products.purchase              import checkout
+from products.stats                 import remove_products
+from core.cache                     import response_cache, invalidate_tags
+from core.models                    import Task
+from core.ratelimit                 import local_counters
+from products.views                 import ProductView
 from users.models                   import User
 from my_settings                    import SECRET_KEY, ALGORITHM
 
@@ -103,6 +117,12 @@ class SetUpTearDown(TestCase):
             )
         ])
 
+        call_command('backfill_thumbnails', stdout=StringIO())
+        call_command('refresh_seller_stats', stdout=StringIO())
+
+    def setUp(self):
+        response_cache().clear()
+
     def tearDown(self):
         User.objects.all().delete()
         Origin.objects.all().delete()
@@ -111,7 +131,22 @@ class SetUpTearDown(TestCase):
         Image.objects.all().delete()
 
 
+class BackfillThumbnailTest(SetUpTearDown):
+    def test_backfill_thumbnails_batches(self):
+        Product.objects.update(thumbnail=None)
+        Image.objects.create(url='zzzz', is_thumbnail=True, product_id=1)
+
+        call_command('backfill_thumbnails', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(list(Product.objects.order_by('id').values_list('thumbnail', flat=True)), ['aaaa', 'ffff', 'gggg'])
+
+
 class SearchTest(SetUpTearDown):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        rebuild_index()
+
     def test_search_get_empty_success(self):
         client = Client()
         response = client.get('/products/search')
@@ -147,6 +182,25 @@ class SearchTest(SetUpTearDown):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_search_get_ranked_success(self):
+        Product.objects.filter(id=2).update(description='상품1 대체상품')
+        rebuild_index()
+
+        client = Client()
+        response = client.get('/products/search?keyword=상품1')
+
+        self.assertEqual([item["id"] for item in response.json()["item"]], [1, 2])
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_get_deleted_product(self):
+        Product.objects.filter(id=2).delete()
+
+        client = Client()
+        response = client.get('/products/search?keyword=상품2')
+
+        self.assertEqual(response.json()["item"], [])
+        self.assertEqual(response.status_code, 200)
+
 
 class SellerListTest(SetUpTearDown):
     def test_seller_list_get_success(self):
@@ -184,6 +238,20 @@ class SellerListTest(SetUpTearDown):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_seller_list_get_category_single_query(self):
+        client = Client()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/products/seller?category=FROZEN')
+
+        users          = connection.ops.quote_name('users')
+        products       = connection.ops.quote_name('products')
+        seller_queries = [query['sql'] for query in queries if f'FROM {users}' in query['sql']]
+        self.assertEqual(len(seller_queries), 1)
+        self.assertIn('EXISTS', seller_queries[0])
+        self.assertFalse(any(query['sql'].startswith(f'SELECT {products}') for query in queries))
+        self.assertEqual([seller["id"] for seller in response.json()["seller"]], [1])
+
     def test_seller_list_get_order_success(self):
         self.maxDiff = None
         client = Client()
@@ -225,6 +293,33 @@ class SellerListTest(SetUpTearDown):
         self.assertEqual(response.status_code, 200)
 
 
+class SellerLeaderboardTest(SetUpTearDown):
+    def test_seller_leaderboard_category_success(self):
+        client = Client()
+        response = client.get('/products/seller?order_by=order&category=DRY')
+        self.assertEqual(response.json(), {"seller": [{"id": 2, "name": "유저2", "profile_image": "zxcv"}]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_seller_leaderboard_purchase(self):
+        buyer = User.objects.create(kakao_account='buyer', name='구매자', profile_image='buyer', point=10**9)
+        checkout(buyer.id, [(2, 150), (3, 10)])
+
+        self.assertEqual(SellerStat.objects.get(user_id=2, category='').total_ordered, 350)
+        self.assertEqual(SellerStat.objects.get(user_id=2, category='DRY').total_ordered, 350)
+        self.assertEqual(SellerStat.objects.get(user_id=1, category='FROZEN').total_ordered, 310)
+        self.assertEqual(SellerStat.objects.get(user_id=1, category='COLD').total_ordered, 100)
+
+        response = Client().get('/products/seller?order_by=order&category=IMPORTED')
+        self.assertEqual([seller["id"] for seller in response.json()["seller"]], [2])
+
+    def test_seller_leaderboard_remove_product(self):
+        remove_products(Product.objects.filter(id=3))
+        Product.objects.filter(id=3).delete()
+
+        self.assertEqual(SellerStat.objects.get(user_id=1, category='').total_ordered, 100)
+        self.assertEqual(SellerStat.objects.get(user_id=1, category='FROZEN').total_ordered, 0)
+
+
 class SellerProductsTest(SetUpTearDown):
     def test_seller_products_invalid_user_error(self):
         client = Client()
@@ -251,7 +346,8 @@ class SellerProductsTest(SetUpTearDown):
                         "price" : "30000.00",
                         "stock" : 3000,
                         "image" : "gggg",
-                    }]
+                    }],
+                    "next_cursor" : None
                 }
         )
         self.assertEqual(response.status_code, 200)
@@ -269,11 +365,22 @@ class SellerProductsTest(SetUpTearDown):
                         "price" : "10000.00",
                         "stock" : 1000,
                         "image" : "aaaa",
-                    }]
+                    }],
+                    "next_cursor" : None
                 }
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_seller_products_get_cursor_success(self):
+        client = Client()
+        response = client.get('/products/seller/1?limit=1')
+        self.assertEqual([item["id"] for item in response.json()["item"]], [1])
+
+        response = client.get(f'/products/seller/1?limit=1&cursor={response.json()["next_cursor"]}')
+        self.assertEqual([item["id"] for item in response.json()["item"]], [3])
+        self.assertEqual(response.json()["next_cursor"], None)
+        self.assertEqual(response.status_code, 200)
+
 
 class ProductListTest(SetUpTearDown):
     def test_product_list_invalid_order_by_error(self):
@@ -311,7 +418,8 @@ class ProductListTest(SetUpTearDown):
                         "ordered_quantity" : 100,
                         "stock" : 1000,
                         "image" : "aaaa"
-                    }]
+                    }],
+                    "next_cursor" : None
                 }
         )
         self.assertEqual(response.status_code, 200)
@@ -345,27 +453,104 @@ class ProductListTest(SetUpTearDown):
                         "ordered_quantity" : 100,
                         "stock" : 1000,
                         "image" : "aaaa"
-                    }]
+                    }],
+                    "next_cursor" : None
                 }
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_product_list_order_cursor_success(self):
+        Product.objects.filter(id=3).update(ordered_quantity=200)
+        client = Client()
+        response = client.get('/products/product?order_by=order&limit=2')
+        self.assertEqual([item["id"] for item in response.json()["item"]], [3, 2])
+
+        response = client.get(f'/products/product?order_by=order&limit=2&cursor={response.json()["next_cursor"]}')
+        self.assertEqual([item["id"] for item in response.json()["item"]], [1])
+        self.assertEqual(response.json()["next_cursor"], None)
+        self.assertEqual(response.status_code, 200)
+
+    def test_product_list_invalid_cursor_error(self):
+        client = Client()
+        response = client.get('/products/product?cursor=abc')
+        self.assertEqual(response.json(), {"message" : "INVALID_CURSOR"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_product_list_invalid_cursor_value_error(self):
+        client = Client()
+
+        for path in [
+            '/products/product?cursor=WyJ4Il0',
+            '/products/seller/1?cursor=W3t9XQ',
+            '/reviews/recent?cursor=WyJ4IiwxXQ',
+            '/products/product?cursor=W251bGxd',
+            '/products/product?order_by=order&cursor=WzEsbnVsbF0',
+            '/products/seller/1?cursor=W251bGxd',
+            '/reviews/recent?cursor=W251bGwsbnVsbF0',
+            '/reviews/recent?cursor=WzFd',
+        ]:
+            response = client.get(path)
+            self.assertEqual(response.json(), {"message" : "INVALID_CURSOR"})
+            self.assertEqual(response.status_code, 400)
+
+    def test_product_list_invalid_limit_error(self):
+        client = Client()
+        response = client.get('/products/product?limit=0')
+        self.assertEqual(response.json(), {"message" : "INVALID_LIMIT"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ResponseCacheTest(SetUpTearDown):
+    def test_response_cache_hit(self):
+        client = Client()
+        first  = client.get('/products/product?order_by=order&category=')
+
+        with self.assertNumQueries(0):
+            second = client.get('/products/product?category=&order_by=order')
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second.status_code, 200)
+
+    def test_response_cache_not_modified(self):
+        client   = Client()
+        response = client.get('/products/seller/1')
+        response = client.get('/products/seller/1', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response.status_code, 304)
+
+    def test_response_cache_invalidate_tag(self):
+        client = Client()
+        client.get('/products/seller/1')
+        client.get('/products/seller/2')
+
+        Product.objects.filter(id=1).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags('seller:1')
+
+        with self.assertNumQueries(0):
+            client.get('/products/seller/2')
+
+        response = client.get('/products/seller/1')
+        self.assertEqual([item["id"] for item in response.json()["item"]], [3])
+
 
 class UploadTest(TestCase):
     def setUp(self):
-        
+        local_counters.clear()
+
         user1 =User.objects.create(
             name              = "백선호1", 
             kakao_account     = "123456", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             )
 
         user2 =User.objects.create(
             name              = "백선호2", 
-            kakao_account     = "123456", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            kakao_account     = "1234567", 
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             )
@@ -410,7 +595,7 @@ class UploadTest(TestCase):
         User.objects.all().delete()
         Product.objects.all().delete()
     
-    @patch('products.views.boto3.client')
+    @patch.object(ProductView, 's3_client')
     def test_upload_success(self, mocked_s3_client):
         client            = Client()
         user              = User.objects.get(name="백선호1")
@@ -441,10 +626,10 @@ class UploadTest(TestCase):
             }
         
         mocked_s3_client.upload = MagicMock(return_value=MockedResponse())
-        response = client.post("/products/upload", body, **headers)
+        response = client.post("/products", body, **headers)
         self.assertEqual(response.status_code, 201)
     
-    @patch('products.views.boto3.client')
+    @patch.object(ProductView, 's3_client')
     def test_empty_image(self, mocked_s3_client):
         client            = Client()
         user              = User.objects.get(name="백선호1")
@@ -475,10 +660,10 @@ class UploadTest(TestCase):
             }
         
         mocked_s3_client.upload = MagicMock(return_value=MockedResponse())
-        response = client.post("/products/upload", body, **headers)
+        response = client.post("/products", body, **headers)
         self.assertEqual(response.status_code, 404)
 
-    @patch('products.views.boto3.client')
+    @patch.object(ProductView, 's3_client')
     def test_upload_full(self, mocked_s3_client):
         client            = Client()
         user              = User.objects.get(name="백선호2")
@@ -509,10 +694,16 @@ class UploadTest(TestCase):
             }
         
         mocked_s3_client.upload = MagicMock(return_value=MockedResponse())
-        response = client.post("/products/upload", body, **headers)
-        self.assertEqual(response.status_code, 400)
 
-    @patch('products.views.boto3.client')
+        for _ in range(4):
+            body['images'] = SimpleUploadedFile('file.jpg', b'file_content', content_type='image/jpg')
+            self.assertEqual(client.post("/products", body, **headers).status_code, 201)
+
+        body['images'] = SimpleUploadedFile('file.jpg', b'file_content', content_type='image/jpg')
+        response = client.post("/products", body, **headers)
+        self.assertEqual(response.status_code, 429)
+
+    @patch.object(ProductView, 's3_client')
     def test_product_delete(self, mocked_s3_client):
         client            = Client()
         user              = User.objects.get(name="백선호1")
@@ -531,9 +722,225 @@ class UploadTest(TestCase):
         headers = {'HTTP_AUTHORIZATION': access_token, 'format': 'multipart'}
         
         mocked_s3_client.upload = MagicMock(return_value=MockedResponse())
-        response = client.delete("/products/upload?product_id=200", **headers)
+        response = client.delete("/products?product_id=200", **headers)
+        self.assertEqual(response.status_code, 204)
+
+
+class ParallelUploadTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Origin.objects.create(id=1, name='DOMESTIC')
+        Storage.objects.create(id=1, name='COLD')
+
+        cls.user = User.objects.create(
+            kakao_account = 'seller@kakao.com',
+            name          = '판매자',
+            profile_image = 'seller',
+            email         = 'seller@kakao.com'
+        )
+
+    def setUp(self):
+        local_counters.clear()
+
+    def post_product(self, image_count, user=None, product_id=None):
+        client = Client()
+        token  = jwt.encode({'id': (user or self.user).id}, SECRET_KEY, algorithm=ALGORITHM)
+        path   = f'/products?product_id={product_id}' if product_id else '/products'
+        body   = {
+            'images'      : [SimpleUploadedFile(f'file{i}.jpg', b'file_content', content_type='image/jpg') for i in range(image_count)],
+            'name'        : '망고',
+            'price'       : 12000,
+            'description' : '안녕하세요',
+            'stock'       : 50,
+            'origin'      : 1,
+            'storage'     : 1
+        }
+        return client.post(path, body, HTTP_AUTHORIZATION=token)
+
+    @patch.object(ProductView, 's3_client')
+    def test_replace_own_product(self, mocked_s3_client):
+        product_id = self.post_product(1).json()['PRODUCT_ID']
+        response   = self.post_product(2, product_id=product_id)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(Product.objects.filter(id=product_id).exists())
+        self.assertEqual(Image.objects.filter(product_id=response.json()['PRODUCT_ID']).count(), 2)
+
+    @patch.object(ProductView, 's3_client')
+    def test_replace_other_sellers_product(self, mocked_s3_client):
+        product_id = self.post_product(1).json()['PRODUCT_ID']
+        other      = User.objects.create(kakao_account='other@kakao.com', name='다른판매자', profile_image='other')
+
+        for path_id in (product_id, 'abc'):
+            response = self.post_product(2, user=other, product_id=path_id)
+
+            self.assertEqual(response.json(), {'MESSAGE': 'INAVILD_PRODUCT'})
+            self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(mocked_s3_client.upload_fileobj.call_count, 1)
+        self.assertEqual(list(Product.objects.values_list('id', flat=True)), [product_id])
+        self.assertEqual(Image.objects.filter(product_id=product_id).count(), 1)
+        self.assertFalse(Task.objects.filter(name='core.delete_files').exists())
+
+    @patch.object(ProductView, 'owns_product', return_value=True)
+    @patch.object(ProductView, 's3_client')
+    def test_replace_other_sellers_product_in_transaction(self, mocked_s3_client, mocked_owns_product):
+        product_id = self.post_product(1).json()['PRODUCT_ID']
+        other      = User.objects.create(kakao_account='other@kakao.com', name='다른판매자', profile_image='other')
+        response   = self.post_product(2, user=other, product_id=product_id)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(list(Product.objects.values_list('id', flat=True)), [product_id])
+        self.assertEqual(mocked_s3_client.delete_objects.call_count, 1)
+
+    @patch.object(ProductView, 's3_client')
+    def test_upload_images_success(self, mocked_s3_client):
+        response = self.post_product(10)
+
+        images = Image.objects.filter(product_id=response.json()['PRODUCT_ID'])
+        self.assertEqual(mocked_s3_client.upload_fileobj.call_count, 10)
+        self.assertEqual(images.count(), 10)
+        self.assertEqual(images.filter(is_thumbnail=True).count(), 1)
+        self.assertFalse(images.filter(url=None).exists())
+        self.assertEqual(Product.objects.get().thumbnail, images.get(is_thumbnail=True).url)
+        self.assertEqual(response.status_code, 201)
+
+    @patch.object(ProductView, 's3_client')
+    def test_upload_images_failure_cleanup(self, mocked_s3_client):
+        def upload_fileobj(file, bucket, key, ExtraArgs):
+            if file.name == 'file3.jpg':
+                raise ClientError({'Error': {'Code': '500'}}, 'PutObject')
+
+        mocked_s3_client.upload_fileobj.side_effect = upload_fileobj
+        response = self.post_product(5)
+
+        deleted = mocked_s3_client.delete_objects.call_args.kwargs['Delete']['Objects']
+        self.assertEqual(mocked_s3_client.delete_objects.call_count, 1)
+        self.assertEqual(len(deleted), 4)
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(response.json(), {'MESSAGE': 'UPLOAD_FAILED'})
+        self.assertEqual(response.status_code, 502)
+
+    @patch.object(ProductView, 's3_client')
+    def test_delete_images_batch(self, mocked_s3_client):
+        product_id = self.post_product(3).json()['PRODUCT_ID']
+        token      = jwt.encode({'id': self.user.id}, SECRET_KEY, algorithm=ALGORITHM)
+        keys       = list(Image.objects.filter(product_id=product_id).values_list('image_uuid', flat=True))
+        response   = Client().delete(f'/products?product_id={product_id}', HTTP_AUTHORIZATION=token)
+
+        self.assertEqual(sorted(Task.objects.get(name='core.delete_files').payload['keys']), sorted(keys))
+        self.assertEqual(mocked_s3_client.delete_objects.call_count, 0)
+
+        with patch('core.storage.s3_client', return_value=mocked_s3_client):
+            call_command('run_tasks', concurrency=0, once=True, stdout=StringIO())
+
+        deleted = mocked_s3_client.delete_objects.call_args.kwargs['Delete']['Objects']
+        self.assertEqual(mocked_s3_client.delete_objects.call_count, 1)
+        self.assertEqual(sorted(obj['Key'] for obj in deleted), sorted(keys))
+        self.assertFalse(Image.objects.filter(product_id=product_id).exists())
         self.assertEqual(response.status_code, 204)
 
+    @override_settings(RATE_LIMITS={'product_upload': (2, 60 * 60 * 24)})
+    @patch.object(ProductView, 's3_client')
+    def test_upload_rate_limited(self, mocked_s3_client):
+        self.assertEqual(self.post_product(1).status_code, 201)
+
+        mocked_s3_client.upload_fileobj.side_effect = ClientError({'Error': {'Code': '500'}}, 'PutObject')
+        self.assertEqual(self.post_product(1).status_code, 502)
+
+        mocked_s3_client.upload_fileobj.side_effect = None
+        self.assertEqual(self.post_product(1).status_code, 201)
+
+        with self.assertNumQueries(0):
+            response = self.post_product(1)
+
+        self.assertEqual(response.json(), {'MESSAGE': 'TOO_MANY_REQUESTS'})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Product.objects.count(), 2)
+
+
+class PresignedUploadTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Origin.objects.create(id=1, name='DOMESTIC')
+        Storage.objects.create(id=1, name='COLD')
+
+        cls.user = User.objects.create(
+            kakao_account = 'seller@kakao.com',
+            name          = '판매자',
+            profile_image = 'seller',
+            email         = 'seller@kakao.com'
+        )
+
+    def setUp(self):
+        local_counters.clear()
+
+    def post_product(self, image_keys):
+        token = jwt.encode({'id': self.user.id}, SECRET_KEY, algorithm=ALGORITHM)
+        body  = {
+            'image_keys'  : image_keys,
+            'name'        : '망고',
+            'price'       : 12000,
+            'description' : '안녕하세요',
+            'stock'       : 50,
+            'origin'      : 1,
+            'storage'     : 1
+        }
+        return Client().post('/products', body, HTTP_AUTHORIZATION=token)
+
+    @patch.object(ProductView, 's3_client')
+    def test_attach_presigned_keys(self, mocked_s3_client):
+        mocked_s3_client.head_object.return_value = {'ContentType': 'image/jpeg'}
+        keys     = [f'uploads/{self.user.id}/a', f'uploads/{self.user.id}/b']
+        response = self.post_product(keys)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mocked_s3_client.upload_fileobj.call_count, 0)
+        self.assertEqual(mocked_s3_client.head_object.call_count, 2)
+        self.assertEqual(list(Image.objects.order_by('id').values_list('image_uuid', flat=True)), keys)
+        self.assertTrue(Product.objects.get().thumbnail.endswith(keys[0]))
+        self.assertEqual(sorted(Task.objects.filter(name='products.process_image').values_list('payload__source_key', flat=True)), keys)
+
+    @patch.object(ProductView, 's3_client')
+    def test_upload_adds_category_stats(self, mocked_s3_client):
+        mocked_s3_client.head_object.return_value = {'ContentType': 'image/jpeg'}
+        self.assertEqual(self.post_product([f'uploads/{self.user.id}/a']).status_code, 201)
+
+        self.assertEqual(set(SellerStat.objects.filter(user_id=self.user.id).values_list('category', flat=True)), {'', 'DOMESTIC', 'COLD'})
+
+        response_cache().clear()
+        response = Client().get('/products/seller?order_by=order&category=COLD')
+        self.assertEqual([seller["id"] for seller in response.json()["seller"]], [self.user.id])
+
+    @patch.object(ProductView, 's3_client')
+    def test_reject_foreign_key(self, mocked_s3_client):
+        mocked_s3_client.head_object.return_value = {'ContentType': 'image/jpeg'}
+        response = self.post_product([f'uploads/{self.user.id + 1}/a'])
+
+        self.assertEqual(response.json(), {'MESSAGE': 'INVALID_IMAGE_KEY'})
+        self.assertEqual(mocked_s3_client.head_object.call_count, 0)
+        self.assertFalse(Product.objects.exists())
+
+    @patch.object(ProductView, 's3_client')
+    def test_reject_missing_or_non_image_object(self, mocked_s3_client):
+        mocked_s3_client.head_object.side_effect = ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        self.assertEqual(self.post_product([f'uploads/{self.user.id}/a']).status_code, 400)
+
+        mocked_s3_client.head_object.side_effect  = None
+        mocked_s3_client.head_object.return_value = {'ContentType': 'text/html'}
+        self.assertEqual(self.post_product([f'uploads/{self.user.id}/a']).status_code, 400)
+        self.assertFalse(Product.objects.exists())
+
+    @patch.object(ProductView, 's3_client')
+    def test_reject_key_already_attached(self, mocked_s3_client):
+        mocked_s3_client.head_object.return_value = {'ContentType': 'image/jpeg'}
+        key = f'uploads/{self.user.id}/a'
+
+        self.assertEqual(self.post_product([key]).status_code, 201)
+        self.assertEqual(self.post_product([key]).json(), {'MESSAGE': 'INVALID_IMAGE_KEY'})
+        self.assertEqual(Product.objects.count(), 1)
+
 
 class DetailPageTest(TestCase):
     @classmethod
@@ -549,7 +956,7 @@ class DetailPageTest(TestCase):
         user1 = User.objects.create(
             name              = "백선호1", 
             kakao_account     = "123456", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             )
@@ -557,7 +964,7 @@ class DetailPageTest(TestCase):
         user2 = User.objects.create(
             name              = "백선호2", 
             kakao_account     = "1234567", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = '2rhadlfrhq@naver.com',
             point             = 1000000
             )
@@ -681,17 +1088,97 @@ class DetailPageTest(TestCase):
         self.assertEqual(response.status_code, 402)
 
 
+class DetailPageQueryCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Origin.objects.create(id=1, name='DOMESTIC')
+        Storage.objects.create(id=1, name='COLD')
+
+        cls.seller = User.objects.create(
+            kakao_account = 'seller@kakao.com',
+            name          = '판매자',
+            profile_image = 'seller',
+            email         = 'seller@kakao.com'
+        )
+
+        User.objects.bulk_create([
+            User(
+                kakao_account = f'buyer{i}@kakao.com',
+                name          = f'구매자{i}',
+                profile_image = f'buyer{i}',
+                email         = f'buyer{i}@kakao.com'
+            ) for i in range(100)
+        ])
+
+    def create_product(self, review_count):
+        product = Product.objects.create(
+            name        = '상품',
+            price       = 10000,
+            description = '상품입니다',
+            stock       = 1000,
+            origin_id   = 1,
+            storage_id  = 1,
+            user_id     = self.seller.id
+        )
+
+        Image.objects.create(product_id=product.id, url='url', is_thumbnail=True)
+
+        Review.objects.bulk_create([
+            Review(
+                user_id    = buyer.id,
+                product_id = product.id,
+                image_url  = f'review{i}',
+                grade      = 5,
+                content    = f'리뷰{i}'
+            ) for i, buyer in enumerate(User.objects.exclude(id=self.seller.id).order_by('id')[:review_count])
+        ])
+
+        Review.objects.bulk_create([
+            Review(
+                user_id    = self.seller.id,
+                product_id = product.id,
+                content    = f'댓글{i}',
+                comment_id = review.id
+            ) for i, review in enumerate(Review.objects.filter(product_id=product.id))
+        ])
+
+        return product
+
+    def test_detailpage_query_count(self):
+        client = Client()
+
+        for review_count in (1, 10, 100):
+            with self.subTest(review_count=review_count):
+                product = self.create_product(review_count)
+
+                with self.assertNumQueries(4):
+                    response = client.get(f'/products/{product.id}')
+
+                reviews = response.json()['RESULT'][0]['product_review']
+                self.assertEqual(len(reviews), review_count)
+                self.assertEqual(reviews[0]['comment']['comment_writer'], '판매자')
+                self.assertEqual(response.status_code, 200)
+
+
 class PurchaseTest(TestCase):
     def setUp(self):
 
         user1 = User.objects.create(
             name              = "백선호1", 
             kakao_account     = "123456", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             ) 
 
+        User.objects.create(
+            name              = "백선호2", 
+            kakao_account     = "1234567", 
+            profile_image     ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            email             = '2rhadlfrhq@naver.com',
+            point             = 1000000
+            ) 
+
         origin = Origin.objects.create(
                 name  = 'Origin1',
          )
@@ -712,38 +1199,204 @@ class PurchaseTest(TestCase):
                 storage_id       = storage.id,
         )
 
-    def test_purchase_success(self):
+    def post_purchase(self, data):
         client = Client()
-        user   = User.objects.get(name='백선호1')
-        token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
-        header       = {"HTTP_Authorization" : token}
-        comment      = {
-            'total_price' : 2000,
-            'quantity'    : 20 
-        }
-        response  = client.post("/products/200/purchase", json.dumps(comment) ,content_type="application/json", **header)
+        user   = User.objects.get(name='백선호2')
+        token  = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
+        header = {"HTTP_Authorization" : token}
+        return client.post("/products/200/purchase", json.dumps(data) ,content_type="application/json", **header)
+
+    def test_purchase_success(self):
+        response = self.post_purchase({'quantity': 20})
+        product  = Product.objects.get(id=200)
+
+        self.assertEqual(User.objects.get(name='백선호2').point, 800000)
+        self.assertEqual(User.objects.get(name='백선호1').point, 1000000)
+        self.assertEqual((product.stock, product.ordered_quantity), (980, 120))
+        self.assertEqual(Order.objects.get().quantity, 20)
         self.assertEqual(response.status_code, 201)
 
     def test_purchase_no_point(self):
-        client = Client()
-        user   = User.objects.get(name='백선호1')
-        token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
-        header       = {"HTTP_Authorization" : token}
-        comment      = {
-            'total_price' : 2000000000,
-            'quantity'    : 20 
-        }
-        response  = client.post("/products/200/purchase", json.dumps(comment) ,content_type="application/json", **header)
+        response = self.post_purchase({'quantity': 101})
+
+        self.assertEqual(response.json(), {"MESSAGE": "INSUFFICIENT_POINTS"})
+        self.assertEqual(Product.objects.get(id=200).stock, 1000)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(response.status_code, 400)
+
+    def test_purchase_out_of_stock(self):
+        Product.objects.filter(id=200).update(stock=10)
+        response = self.post_purchase({'quantity': 20})
+
+        self.assertEqual(response.json(), {"MESSAGE": "OUT_OF_STOCK"})
+        self.assertEqual(User.objects.get(name='백선호2').point, 1000000)
+        self.assertEqual(response.status_code, 400)
+
+    def test_purchase_invalid_quantity(self):
+        response = self.post_purchase({'quantity': -1})
+
+        self.assertEqual(response.json(), {"MESSAGE": "INVALID_QUANTITY"})
         self.assertEqual(response.status_code, 400)
 
     def test_purchase_key_error(self):
+        response = self.post_purchase({'quantitys': 20})
+
+        self.assertEqual(response.json(), {"MESSAGE": "KEY_ERROR"})
+        self.assertEqual(response.status_code, 400)
+
+
+class CheckoutTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create(
+            kakao_account = 'seller@kakao.com',
+            name          = '판매자',
+            profile_image = 'seller',
+            point         = 0
+        )
+
+        cls.buyer = User.objects.create(
+            kakao_account = 'buyer@kakao.com',
+            name          = '구매자',
+            profile_image = 'buyer',
+            point         = 1000000
+        )
+
+        Product.objects.bulk_create([
+            Product(
+                id          = 300+i,
+                name        = f'상품{i}',
+                price       = 1000,
+                description = '상품입니다',
+                stock       = 10,
+                user_id     = cls.seller.id
+            ) for i in range(20)
+        ])
+
+    def setUp(self):
+        local_counters.clear()
+
+    def post_checkout(self, items):
         client = Client()
-        user   = User.objects.get(name='백선호1')
-        token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
-        header       = {"HTTP_Authorization" : token}
-        comment      = {
-            'total_prices' : 2000,
-            'quantity'    : 20 
-        }
-        response  = client.post("/products/200/purchase", json.dumps(comment) ,content_type="application/json", **header)
+        token  = jwt.encode({'id': self.buyer.id}, SECRET_KEY, algorithm=ALGORITHM)
+        return client.post('/products/checkout', json.dumps({'items': items}), content_type='application/json', HTTP_AUTHORIZATION=token)
+
+    def test_checkout_success(self):
+        response = self.post_checkout([
+            {'product_id': 300, 'quantity': 2},
+            {'product_id': 301, 'quantity': 3},
+            {'product_id': 300, 'quantity': 1}
+        ])
+
+        self.assertEqual(User.objects.get(id=self.buyer.id).point, 994000)
+        self.assertEqual(list(Product.objects.filter(id__in=[300, 301]).order_by('id').values_list('stock', 'ordered_quantity')), [(7, 3), (7, 3)])
+        self.assertEqual(list(Order.objects.order_by('product_id').values_list('product_id', 'quantity')), [(300, 3), (301, 3)])
+        self.assertEqual(response.status_code, 201)
+
+    def test_checkout_constant_queries(self):
+        self.post_checkout([{'product_id': 300, 'quantity': 1}])
+
+        with CaptureQueriesContext(connection) as single:
+            self.post_checkout([{'product_id': 300, 'quantity': 1}])
+
+        with CaptureQueriesContext(connection) as cart:
+            self.post_checkout([{'product_id': 300+i, 'quantity': 1} for i in range(20)])
+
+        self.assertEqual(len(cart), len(single))
+        self.assertEqual(Order.objects.count(), 22)
+
+    def test_checkout_out_of_stock_rollback(self):
+        response = self.post_checkout([
+            {'product_id': 300, 'quantity': 2},
+            {'product_id': 301, 'quantity': 11}
+        ])
+
+        self.assertEqual(response.json(), {'MESSAGE': 'OUT_OF_STOCK'})
+        self.assertEqual(Product.objects.get(id=300).stock, 10)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(response.status_code, 400)
+
+    def test_checkout_no_product(self):
+        response = self.post_checkout([{'product_id': 999, 'quantity': 1}])
+
+        self.assertEqual(response.json(), {'MESSAGE': 'NO_PRODUCT'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_checkout_empty_cart(self):
+        response = self.post_checkout([])
+
+        self.assertEqual(response.json(), {'MESSAGE': 'EMPTY_CART'})
         self.assertEqual(response.status_code, 400)
+
+
+class ImageVariantTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user    = User.objects.create(kakao_account='variant', name='판매자', profile_image='')
+        cls.product = Product.objects.create(user_id=cls.user.id, name='사과', price=1000, description='', stock=1, thumbnail='original')
+        cls.review  = Review.objects.create(user_id=cls.user.id, product_id=cls.product.id, content='리뷰', grade=5, image_uuid='review-key')
+
+        Image.objects.create(product_id=cls.product.id, url='original', image_uuid='product-key', is_thumbnail=True)
+
+    def setUp(self):
+        buffer = BytesIO()
+        PILImage.new('RGB', (2000, 1000), 'red').save(buffer, 'PNG')
+
+        self.client_mock = MagicMock()
+        self.client_mock.get_object.side_effect = lambda Bucket, Key: {'Body': BytesIO(buffer.getvalue())}
+
+        self.patcher = patch('products.images.s3_client', return_value=self.client_mock)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_process_images_inline(self):
+        enqueue_images(['product-key', 'review-key'])
+
+        call_command('run_tasks', concurrency=0, once=True, stdout=StringIO())
+
+        variants = ImageVariant.objects.filter(source_key='product-key')
+        listing  = variants.get(name='list', format='webp')
+
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(variants.count(), 6)
+        self.assertEqual((listing.width, listing.height), (320, 160))
+        self.assertEqual((variants.get(name='full', format='jpeg').width), 1600)
+        self.assertEqual(Product.objects.get(id=self.product.id).thumbnail, listing.url)
+        self.assertTrue(Review.objects.get(id=self.review.id).thumbnail.endswith('variants/review-key/list.webp'))
+
+        content_types = {call.kwargs['Key']: call.kwargs['ContentType'] for call in self.client_mock.put_object.call_args_list}
+        self.assertEqual(content_types['variants/product-key/detail.webp'], 'image/webp')
+        self.assertEqual(content_types['variants/product-key/detail.jpg'], 'image/jpeg')
+
+    @override_settings(TASK_MAX_ATTEMPTS=2, TASK_RETRY_BACKOFF=0)
+    def test_failed_task_retried_then_dead(self):
+        self.client_mock.get_object.side_effect = ClientError({'Error': {'Code': '404'}}, 'GetObject')
+        enqueue_images(['product-key'])
+
+        call_command('run_tasks', concurrency=0, once=True, stdout=StringIO(), stderr=StringIO())
+
+        task = Task.objects.get()
+        self.assertEqual(self.client_mock.get_object.call_count, 2)
+        self.assertEqual((task.status, task.attempts), (Task.Status.DEAD, 2))
+        self.assertIn('ClientError', task.error)
+        self.assertEqual(Product.objects.get(id=self.product.id).thumbnail, 'original')
+
+    def test_discarded_image_skipped(self):
+        enqueue_images(['deleted-key'])
+
+        call_command('run_tasks', concurrency=0, once=True, stdout=StringIO())
+
+        self.assertEqual(self.client_mock.get_object.call_count, 0)
+        self.assertFalse(Task.objects.exists())
+
+    def test_enqueue_missing(self):
+        enqueue_images(['product-key'])
+
+        call_command('enqueue_image_variants', stdout=StringIO())
+
+        self.assertEqual(
+            sorted(Task.objects.values_list('payload__source_key', flat=True)),
+            ['product-key', 'review-key']
+        )
@@ -1,6 +1,6 @@
 from django.urls    import path
 
-from products.views import ProductView, SearchView, SellerListView, ProductListView, SellerProductsView, DetailPageView, PurchaseView
+from products.views import ProductView, SearchView, SellerListView, ProductListView, SellerProductsView, DetailPageView, PurchaseView, CheckoutView
 
 urlpatterns = [
     path('/search', SearchView.as_view()),
@@ -8,6 +8,7 @@ urlpatterns = [
     path('/product', ProductListView.as_view()),
     path('/seller/<user_id>', SellerProductsView.as_view()),
     path("", ProductView.as_view()),
+    path("/checkout", CheckoutView.as_view()),
     path("/<int:product_id>", DetailPageView.as_view()),
     path("/<int:product_id>/purchase", PurchaseView.as_view()),
 ]
@@ -1,30 +1,54 @@
-import json, boto3, uuid
+import json, boto3
 
-from datetime           import date
+from core.utils          import database_sync_to_async
+from botocore.exceptions import BotoCoreError, ClientError
 
 
-from django.http        import JsonResponse
+from core.http          import JsonResponse
 from django.views       import View
-from django.db.models   import Case, When, Q, Prefetch, Sum, F
+from django.db.models   import Q, Prefetch, Exists, OuterRef
 from django.db          import transaction
 
 
 from users.models       import User
 from products.models    import Origin, Storage, Product, Image, Order
+from products.search    import index_product, search_products, search_sellers
+from products.images    import enqueue_images, discard_images
+from products.purchase  import PurchaseError, purchase, checkout
+from products.stats     import ALL, add_product, remove_products, leaderboard
 from reviews.models     import Review
-from users.utils        import login
-from my_settings        import ACCESS_KEY_ID, BUCKET_NAME, SECRET_ACESS_KEY, AWS_S3_URL
+from reviews.feed       import recent_reviews
+from users.utils        import login, rate_limit
+from core.cache         import cache_response, invalidate_tags
+from core.pagination    import PaginationError, paginate
+from core.storage       import upload_files_async, delete_files_async, verify_uploads_async
+from core.views         import AsyncView
+from my_settings        import ACCESS_KEY_ID, SECRET_ACESS_KEY, AWS_S3_URL
+
+
+PRODUCT_FIELDS = ('id', 'name', 'price', 'stock', 'thumbnail')
+SELLER_FIELDS  = ('id', 'name', 'profile_image')
 
 
 class SearchView(View):
+    @cache_response('search', params=('keyword',), tags=('products', 'sellers'))
     def get(self, request):
         keyword  = request.GET.get("keyword", "")
 
         if not keyword:
             return JsonResponse({"seller": [], "item": []}, status=200)
 
-        users    = User.objects.filter(name__icontains=keyword)
-        products = Product.objects.filter(name__icontains=keyword).annotate(thumbnail=Case(When(image__is_thumbnail=True, then='image__url'))).exclude(thumbnail=None)
+        user_ids    = search_sellers(keyword)
+        product_ids = search_products(keyword)
+
+        users    = User.objects.filter(id__in=user_ids).values_list(*SELLER_FIELDS, 'kakao_account', named=True)
+        products = Product.objects.filter(id__in=product_ids).exclude(thumbnail=None).values_list(*PRODUCT_FIELDS, named=True)
+
+        users    = {user.id: user for user in users}
+        products = {product.id: product for product in products}
+
+        users    = [users[user_id] for user_id in user_ids if user_id in users]
+        products = [products[product_id] for product_id in product_ids if product_id in products]
 
         seller = [{
             "id"            : user.id,
@@ -44,7 +68,7 @@ class SearchView(View):
         return JsonResponse({"seller": seller, "item": item}, status=200)
 
 
-class ProductView(View):
+class ProductView(AsyncView):
     s3_client = boto3.client(
         's3',
         aws_access_key_id     = ACCESS_KEY_ID,
@@ -52,7 +76,8 @@ class ProductView(View):
     )
 
     @login
-    def post(self, request):
+    @rate_limit('product_upload')
+    async def post(self, request):
         name         = request.POST.get('name')
         price        = request.POST.get('price')
         description  = request.POST.get('description')
@@ -60,60 +85,95 @@ class ProductView(View):
         origin       = request.POST.get('origin')
         storage      = request.POST.get('storage')
         images       = request.FILES.getlist('images')
+        image_keys   = request.POST.getlist('image_keys')
         product_id   = request.GET.get('product_id', None)
 
-        if not images:
+        if not images and not image_keys:
             return JsonResponse({"MESSAGE": "IMAGE_FILES_NONE"}, status=404)
 
-        if Product.objects.filter(user_id=request.user.id, create_at=date.today()).count() > 3:
-            return JsonResponse({"MESSAGE": "YOU_CANT_UPLOAD"}, status=400)
+        if product_id and not await database_sync_to_async(self.owns_product)(request.user, product_id):
+            return JsonResponse({"MESSAGE": "INAVILD_PRODUCT"}, status=404)
+
+        try:
+            if image_keys and not await self.verify_image_keys(request.user, image_keys):
+                return JsonResponse({"MESSAGE": "INVALID_IMAGE_KEY"}, status=400)
+
+            keys = image_keys + await upload_files_async(self.s3_client, images)
+        except (BotoCoreError, ClientError):
+            return JsonResponse({"MESSAGE": "UPLOAD_FAILED"}, status=502)
+
+        titles = [''] * len(image_keys) + [image.name for image in images]
+
+        fields = {
+            'user_id'     : request.user.id,
+            'name'        : name,
+            'price'       : price,
+            'description' : description,
+            'stock'       : stock,
+            'origin_id'   : origin,
+            'storage_id'  : storage,
+        }
 
+        try:
+            product = await database_sync_to_async(self.save_product)(request.user, fields, keys, titles, product_id)
+        except Product.DoesNotExist:
+            await delete_files_async(self.s3_client, keys)
+            return JsonResponse({"MESSAGE": "INAVILD_PRODUCT"}, status=404)
+        except Exception:
+            await delete_files_async(self.s3_client, keys)
+            raise
+
+        if product_id:
+            return JsonResponse({"PRODUCT_ID" : product.id, 'MESSAGE' : "SUCCESS1"}, status=202)
+        else:
+            return JsonResponse({"PRODUCT_ID" : product.id, 'MESSAGE' : "SUCCESS"}, status=201)
+
+    async def verify_image_keys(self, user, keys):
+        if len(set(keys)) != len(keys) or await database_sync_to_async(self.keys_in_use)(keys):
+            return False
+
+        return await verify_uploads_async(self.s3_client, user.id, keys)
+
+    def owns_product(self, user, product_id):
+        return product_id.isdigit() and Product.objects.filter(user_id=user.id, id=product_id).exists()
+
+    def keys_in_use(self, keys):
+        return Image.objects.filter(image_uuid__in=keys).exists() or Review.objects.filter(image_uuid__in=keys).exists()
+
+    def save_product(self, user, fields, keys, titles, product_id):
         with transaction.atomic():
-            product= Product.objects.create(
-                user_id     = request.user.id,
-                name        = name,
-                price       = price,
-                description = description,
-                stock       = stock,
-                origin_id   = origin,
-                storage_id  = storage
-            )           
+            replaced = Product.objects.filter(user_id=user.id, id=product_id)
+
+            if product_id and not replaced.exists():
+                raise Product.DoesNotExist
+
+            product = Product.objects.create(**fields, thumbnail=f"{AWS_S3_URL}/{keys[0]}")
 
             Image.objects.bulk_create(
                 [Image( 
                 product_id   = product.id,
-                url          = None,
+                title        = title,
+                url          = f"{AWS_S3_URL}/{key}",
+                image_uuid   = key,
                 is_thumbnail = True if i ==0 else False
-                )for i in range(len(images))]                
+                )for i, (title, key) in enumerate(zip(titles, keys))]                
             )
+            enqueue_images(keys)
+
+            index_product(product, user.name)
+            add_product(product)
 
-            for i, image in enumerate(images):
-                my_uuid = str(uuid.uuid4())
-                upload  = Image.objects.filter(product_id = product.id)[i]
-                self.s3_client.upload_fileobj(
-                    image,
-                    BUCKET_NAME,
-                    my_uuid,
-                    ExtraArgs = {
-                        'ContentType' : image.content_type
-                    }
-                )
-
-                image_urls   = f"{AWS_S3_URL}/{my_uuid}"
-                upload.image_uuid = my_uuid
-                upload.url   = image_urls
-                upload.title = image.name
-                upload.save()
-            
             if product_id:
-                for i in range(len(Image.objects.filter(product_id=product_id))):
-                    self.s3_client.delete_object(Bucket=BUCKET_NAME, Key=Image.objects.filter(product_id=product_id)[i].image_uuid)
-                
-                Product.objects.filter(id=product_id).delete()
+                discard_images(Image.objects.filter(product__in=replaced).values_list('image_uuid', flat=True))
+                remove_products(replaced)
+                replaced.delete()
+
+        invalidate_tags('products', 'sellers', f'seller:{user.id}', 'reviews')
 
-                return JsonResponse({"PRODUCT_ID" : product.id, 'MESSAGE' : "SUCCESS1"}, status=202)
-            else:
-                return JsonResponse({"PRODUCT_ID" : product.id, 'MESSAGE' : "SUCCESS"}, status=201)
+        if product_id:
+            recent_reviews.reset()
+
+        return product
 
     @login
     def delete(self, request):
@@ -123,11 +183,11 @@ class ProductView(View):
             return JsonResponse({"MESSAGE": "INAVILD_PRODUCT"}, status=404)
         
         with transaction.atomic():
-
-            for i in range(len(Image.objects.filter(product_id=product_id))):
-                self.s3_client.delete_object(Bucket=BUCKET_NAME, Key=Image.objects.filter(product_id=product_id)[i].image_uuid)
-            
-            Product.objects.get(id=product_id).delete()
+            discard_images(Image.objects.filter(product_id=product_id).values_list('image_uuid', flat=True))
+            remove_products(Product.objects.filter(id=product_id))
+            Product.objects.filter(id=product_id).delete()
+            invalidate_tags('products', 'sellers', f'seller:{request.user.id}', 'reviews')
+            transaction.on_commit(recent_reviews.reset)
 
         return JsonResponse({"MESSAGE" : "NO_CONTENT"}, status=204)
 
@@ -155,37 +215,31 @@ class ProductView(View):
  
 
 class SellerListView(View):
+    @cache_response('seller_list', params=('category', 'order_by'), tags=('sellers',))
     def get(self, request):
         category = request.GET.get("category", "")
         order_by = request.GET.get("order_by", "")
 
-        user_q    = Q()
-        product_q = Q()
+        users = User.objects.all()
 
         if category in Origin.Type.names:
-            origin_type = Origin.Type.names.index(category)+1
-            user_q      = Q(product__origin_id=origin_type) 
-            product_q   = Q(origin_id=origin_type)
+            users = users.filter(Exists(Product.objects.filter(user_id=OuterRef('id'), origin_id=Origin.Type.names.index(category)+1)))
         elif category in Storage.Type.names:
-            storage_type = Storage.Type.names.index(category)+1
-            user_q       = Q(product__storage_id=storage_type)
-            product_q    = Q(storage_id=storage_type)
+            users = users.filter(Exists(Product.objects.filter(user_id=OuterRef('id'), storage_id=Storage.Type.names.index(category)+1)))
+        else:
+            category = ALL
 
         if order_by and order_by not in ["order", "id"]:
             return JsonResponse({"message": "INVALID_ORDER_BY"}, status=400)
 
-        if order_by == "id":
-            order_by = '-' + order_by
-        elif order_by == "order":
-            order_by = '-total_' + order_by
-
-        users = []
-        if order_by:
-            users = User.objects.annotate(total_order=Sum('product__ordered_quantity')).order_by(order_by)[:10]
+        if order_by == "order":
+            users = leaderboard(category)
+        elif order_by == "id":
+            users = users.order_by('-id')[:10]
         else:
-            users = User.objects.filter(user_q).prefetch_related(
-                        Prefetch('product_set', queryset=Product.objects.filter(product_q), to_attr='category')
-            ).order_by('id').distinct()
+            users = users.order_by('id')
+
+        users = users.values_list(*SELLER_FIELDS, named=True)
 
         seller = [{
             "id"            : user.id,
@@ -197,6 +251,7 @@ class SellerListView(View):
 
 
 class SellerProductsView(View):
+    @cache_response('seller_products', params=('category', 'cursor', 'limit'), tags=('seller:{user_id}',))
     def get(self, request, user_id):
         category = request.GET.get("category", "")
  
@@ -210,7 +265,12 @@ class SellerProductsView(View):
         elif category in Storage.Type.names:
             q &= Q(storage_id=Storage.Type.names.index(category)+1)
 
-        products = Product.objects.filter(q).annotate(thumbnail=Case(When(image__is_thumbnail=True, then='image__url'))).exclude(thumbnail=None)
+        products = Product.objects.filter(q).exclude(thumbnail=None).values_list(*PRODUCT_FIELDS, named=True)
+
+        try:
+            products, next_cursor = paginate(products, ('id',), request.GET.get('cursor'), request.GET.get('limit'))
+        except PaginationError as e:
+            return JsonResponse({"message": e.message}, status=400)
  
         item = [{
             "id"       : product.id,
@@ -220,10 +280,11 @@ class SellerProductsView(View):
             "image"    : product.thumbnail,
         } for product in products]
 
-        return JsonResponse({"item": item}, status=200)
+        return JsonResponse({"item": item, "next_cursor": next_cursor}, status=200)
 
 
 class ProductListView(View):
+    @cache_response('product_list', params=('category', 'order_by', 'cursor', 'limit'), tags=('products',))
     def get(self, request):
         category  = request.GET.get("category", "")
         order_by = request.GET.get("order_by", "")
@@ -238,11 +299,16 @@ class ProductListView(View):
             return JsonResponse({"message": "INVALID_ORDER_BY"}, status=400)
 
         if order_by == "order":
-            order_by = '-' + order_by + 'ed_quantity'
+            ordering = ('-ordered_quantity', '-id')
         else:
-            order_by = '-id'
+            ordering = ('-id',)
 
-        products = Product.objects.filter(q).annotate(thumbnail=Case(When(image__is_thumbnail=True, then='image__url'))).exclude(thumbnail=None).order_by(order_by)[:10]
+        products = Product.objects.filter(q).exclude(thumbnail=None).values_list(*PRODUCT_FIELDS, 'ordered_quantity', named=True)
+
+        try:
+            products, next_cursor = paginate(products, ordering, request.GET.get('cursor'), request.GET.get('limit'))
+        except PaginationError as e:
+            return JsonResponse({"message": e.message}, status=400)
 
         item = [{
             "id"               : product.id,
@@ -253,16 +319,24 @@ class ProductListView(View):
             "image"            : product.thumbnail
         } for product in products]
 
-        return JsonResponse({"item": item}, status=200)
+        return JsonResponse({"item": item, "next_cursor": next_cursor}, status=200)
 
 
 class DetailPageView(View):
     def get(self, request, product_id):        
-        if not Product.objects.filter(id=product_id).exists():
+        comments = Review.objects.filter(grade=None).select_related("user").order_by("id")
+        reviews  = Review.objects.filter(comment=None).select_related("user").prefetch_related(
+            Prefetch("review_set", queryset=comments, to_attr="comments")
+        )
+
+        try:
+            product = Product.objects.select_related("user").prefetch_related(
+                "image_set",
+                Prefetch("review_set", queryset=reviews, to_attr="reviews")
+            ).get(id=product_id)
+        except Product.DoesNotExist:
             return JsonResponse({"MESSAGE":"NO_ITEM"}, status=400)
-    
-        product = Product.objects.prefetch_related("image_set", "review_set").select_related("user").get(id=product_id)
-        reviews = product.review_set.filter(product=product.id, comment=None)
+
         result = [{
             "product_name"        : product.name,
             "seller_name"         : product.user.name,
@@ -282,12 +356,12 @@ class DetailPageView(View):
                     "grade"         : review.grade,
                     "create_at"     : review.create_at,
                     "comment"       : {
-                            "comment_writer"    : review.review_set.get(grade=None).user.name,
-                            "comment_content"   : review.review_set.get(grade=None).content,
-                            "comment_create_at" : review.review_set.get(grade=None).create_at                
-                    } if review.review_set.filter(grade=None).exists() else None
+                            "comment_writer"    : review.comments[0].user.name,
+                            "comment_content"   : review.comments[0].content,
+                            "comment_create_at" : review.comments[0].create_at                
+                    } if review.comments else None
                 }
-            for review in reviews] if reviews.exists() else None
+            for review in product.reviews] if product.reviews else None
         }]
 
         return JsonResponse({'RESULT':result}, status=200)
@@ -305,30 +379,36 @@ class DetailPageView(View):
 
 class PurchaseView(View):
     @login
+    @rate_limit('purchase')
     def post(self, request, product_id):
         try:
-            data   = json.loads(request.body)
-            with transaction.atomic():
-                product = Product.objects.select_related("user").get(id=product_id)
-                
-                if product.user.point < data['total_price']:
-                    return JsonResponse({"MESSAGE":"INSUFFICIENT_POINTS"}, status=400)
-
-                product.user.point = F('point') - data['total_price']
-                product.user.save()            
-                
-                product.ordered_quantity = F("ordered_quantity") + data['quantity']
-                product.stock            = F("stock") - data['quantity'] 
-                product.save()
-                
-                Order.objects.create(
-                    user_id  = request.user.id,
-                    product_id  = product_id,
-                    quantity = data['quantity']
-                )
-                
+            data = json.loads(request.body)
+
+            purchase(request.user.id, product_id, data['quantity'])
             
             return JsonResponse({'MESSAGE': "SUCCESS"}, status=201)
         
         except KeyError:
             return JsonResponse({"MESSAGE": "KEY_ERROR"}, status=400)
+
+        except PurchaseError as e:
+            return JsonResponse({"MESSAGE": e.message}, status=e.status)
+
+
+class CheckoutView(View):
+    @login
+    @rate_limit('purchase')
+    def post(self, request):
+        try:
+            data  = json.loads(request.body)
+            items = [(item['product_id'], item['quantity']) for item in data['items']]
+
+            checkout(request.user.id, items)
+
+            return JsonResponse({'MESSAGE': "SUCCESS"}, status=201)
+
+        except (KeyError, TypeError):
+            return JsonResponse({"MESSAGE": "KEY_ERROR"}, status=400)
+
+        except PurchaseError as e:
+            return JsonResponse({"MESSAGE": e.message}, status=e.status)
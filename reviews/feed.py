@@ -0,0 +1,77 @@
+import threading, time
+
+from collections     import deque
+
+from django.conf     import settings
+
+from core.pagination import row_cursor
+
+
+ORDERING = ('-create_at', '-id')
+FIELDS   = ('id', 'create_at', 'product__name', 'thumbnail', 'image_url', 'grade', 'content')
+
+
+def project(reviews):
+    return reviews.values_list(*FIELDS, named=True)
+
+
+def serialize(review):
+    return {
+        "product_name" : review.product__name,
+        "image_url"    : review.thumbnail or review.image_url,
+        "grade"        : review.grade,
+        "content"      : review.content
+    }
+
+
+class RecentReviewBuffer:
+    def __init__(self, size, ttl):
+        self.size      = size
+        self.ttl       = ttl
+        self.entries   = deque(maxlen=size)
+        self.lock      = threading.Lock()
+        self.primed_at = None
+        self.exhausted = False
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def is_warm(self):
+        return self.primed_at is not None and time.monotonic() - self.primed_at < self.ttl
+
+    def prime(self, reviews):
+        with self.lock:
+            self.entries.clear()
+            self.entries.extend((row_cursor(review, ORDERING), serialize(review)) for review in reviews[:self.size])
+            self.exhausted = len(reviews) <= self.size
+            self.primed_at = time.monotonic()
+
+    def push(self, review):
+        with self.lock:
+            if self.primed_at is None:
+                return
+
+            if len(self.entries) == self.size:
+                self.exhausted = False
+
+            self.entries.appendleft((row_cursor(review, ORDERING), serialize(review)))
+
+    def reset(self):
+        with self.lock:
+            self.entries.clear()
+            self.primed_at = None
+
+    def page(self, limit):
+        with self.lock:
+            if not self.is_warm() or (limit > len(self.entries) and not self.exhausted):
+                return None
+
+            entries     = list(self.entries)[:limit]
+            has_more    = len(self.entries) > limit or not self.exhausted
+            next_cursor = entries[-1][0] if entries and has_more else None
+
+            return [item for _, item in entries], next_cursor
+
+
+recent_reviews = RecentReviewBuffer(settings.RECENT_REVIEW_BUFFER_SIZE, settings.RECENT_REVIEW_BUFFER_TTL)
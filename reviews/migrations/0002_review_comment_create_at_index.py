@@ -0,0 +1,17 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['comment', 'create_at'], name='reviews_comment_457492_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_comment_create_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['product', 'comment'], name='reviews_product_c2d276_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'product', 'grade', 'image_uuid'], name='reviews_user_id_72201e_idx'),
+        ),
+    ]
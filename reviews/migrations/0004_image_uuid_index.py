@@ -0,0 +1,17 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['image_uuid'], name='reviews_image_u_1f8948_idx'),
+        ),
+    ]
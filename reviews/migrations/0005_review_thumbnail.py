@@ -0,0 +1,18 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_image_uuid_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='thumbnail',
+            field=models.CharField(max_length=200, null=True),
+        ),
+    ]
@@ -6,6 +6,7 @@ class Review(models.Model):
     product    = models.ForeignKey('products.Product', on_delete=models.CASCADE)
     image_url  = models.CharField(max_length=200, default='', null=True)
     image_uuid = models.CharField(max_length=100, null=True)
+    thumbnail  = models.CharField(max_length=200, null=True)
     grade      = models.CharField(max_length=10,null=True)
     content    = models.TextField()
     comment    = models.ForeignKey("self", on_delete=models.SET_NULL, null=True)
@@ -13,6 +14,12 @@ class Review(models.Model):
     
     class Meta:
         db_table = 'reviews'
+        indexes  = [
+            models.Index(fields=['comment', 'create_at']),
+            models.Index(fields=['product', 'comment']),
+            models.Index(fields=['user', 'product', 'grade', 'image_uuid']),
+            models.Index(fields=['image_uuid']),
+        ]
 
 
 
@@ -1,10 +1,13 @@
 from inspect import GEN_CREATED
 import jwt, json
 
+from collections                    import deque
+
 from django.db.transaction          import clean_savepoints 
 from django.test                    import TestCase, Client
 from django.core.files.uploadedfile import SimpleUploadedFile
 from unittest.mock                  import MagicMock, patch
+from botocore.exceptions            import ClientError
 
 from django.test                    import TestCase, Client
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -16,6 +19,9 @@ from users.models    import User
 from reviews.models  import Review
 from my_settings     import SECRET_KEY, ALGORITHM
 from products.models import Product, Image, Origin, Storage, Order
+from reviews.feed    import project, recent_reviews
+from reviews.views   import ReviewView
+from core.cache      import response_cache
 
 
 
@@ -25,7 +31,7 @@ class PostReviewCommentTest(TestCase):
         user1 =User.objects.create(
             name              = "백선호1", 
             kakao_account     = "123456", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             )
@@ -34,7 +40,7 @@ class PostReviewCommentTest(TestCase):
             id                = 200,
             name              = "백선호2", 
             kakao_account     = "1234567", 
-            profile_image_url ='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image     = 'http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email             = 'rhadlfrhq@naver.com',
             point             = 1000000
             )
@@ -101,7 +107,7 @@ class PostReviewCommentTest(TestCase):
         User.objects.all().delete()
         Product.objects.all().delete()
 
-    @patch('products.views.boto3.client')
+    @patch.object(ReviewView, 's3_client')
     def test_post_review_success(self, mocked_s3_client):
         client = Client()
         user   = User.objects.get(name='백선호1')
@@ -127,7 +133,7 @@ class PostReviewCommentTest(TestCase):
         response = client.post("/reviews/200", body, **headers)
         self.assertEqual(response.status_code, 201)
 
-    @patch('products.views.boto3.client')
+    @patch.object(ReviewView, 's3_client')
     def test_post_review_key_error(self, mocked_s3_client):
         client = Client()
         user   = User.objects.get(name='백선호1')
@@ -324,13 +330,19 @@ class SetUpTearDown(TestCase):
                 content    = "리뷰3",
                 product_id = Product.objects.get(id=3).id
             )
-            Review(
-                user_id    = User.objects.get(id=2).id,
-                content    = "코멘트1",
-                product_id = Product.objects.get(id=1).id
-                comment_id = Review.objects.get(id=1).id
         ])
 
+        Review.objects.create(
+            user_id    = User.objects.get(id=2).id,
+            content    = "코멘트1",
+            product_id = Product.objects.get(id=1).id,
+            comment_id = Review.objects.get(id=1).id
+        )
+
+    def setUp(self):
+        response_cache().clear()
+        recent_reviews.reset()
+
     def tearDown(self):
         User.objects.all().delete()
         Origin.objects.all().delete()
@@ -360,10 +372,134 @@ class RecentReviewTest(SetUpTearDown):
                     },
                     {
                         "product_name" : "상품1",
-                        "image_url" : "review3",
+                        "image_url" : "review1",
                         "grade" : "3",
                         "content" : "리뷰1"
-                    }]
+                    }],
+                    "next_cursor" : None
                 }
         )
         self.assertEqual(response.status_code, 200)
+
+    def test_recent_review_get_cursor_success(self):
+        client = Client()
+        response = client.get('/reviews/recent?limit=2')
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰3", "리뷰2"])
+
+        response = client.get(f'/reviews/recent?limit=2&cursor={response.json()["next_cursor"]}')
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰1"])
+        self.assertEqual(response.json()["next_cursor"], None)
+        self.assertEqual(response.status_code, 200)
+
+    def test_recent_review_invalid_limit_error(self):
+        client = Client()
+        response = client.get('/reviews/recent?limit=a')
+        self.assertEqual(response.json(), {"message" : "INVALID_LIMIT"})
+        self.assertEqual(response.status_code, 400)
+
+
+class RecentReviewBufferTest(SetUpTearDown):
+    def setUp(self):
+        super().setUp()
+        self.buffer = patch.multiple(recent_reviews, size=2, entries=deque(maxlen=2))
+        self.buffer.start()
+
+    def tearDown(self):
+        self.buffer.stop()
+        recent_reviews.reset()
+
+    def test_recent_review_buffer_hit(self):
+        client = Client()
+        client.get('/reviews/recent?limit=1')
+        response_cache().clear()
+
+        with self.assertNumQueries(0):
+            response = client.get('/reviews/recent?limit=2')
+
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰3", "리뷰2"])
+
+        response = client.get(f'/reviews/recent?limit=2&cursor={response.json()["next_cursor"]}')
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰1"])
+
+    def test_recent_review_buffer_push(self):
+        client = Client()
+        client.get('/reviews/recent?limit=1')
+
+        review = Review.objects.create(
+            user_id    = User.objects.get(id=1).id,
+            grade      = 5,
+            content    = "리뷰4",
+            product_id = Product.objects.get(id=2).id
+        )
+        recent_reviews.push(project(Review.objects.filter(id=review.id)).get())
+        response_cache().clear()
+
+        with self.assertNumQueries(0):
+            response = client.get('/reviews/recent?limit=2')
+
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰4", "리뷰3"])
+
+    def test_recent_review_buffer_fallback(self):
+        client   = Client()
+        response = client.get('/reviews/recent?limit=3')
+
+        self.assertEqual([review["content"] for review in response.json()["recent_review"]], ["리뷰3", "리뷰2", "리뷰1"])
+
+
+class AsyncReviewUploadTest(SetUpTearDown):
+    def setUp(self):
+        super().setUp()
+        self.headers = {'HTTP_Authorization': jwt.encode({'id': User.objects.get(id=2).id}, SECRET_KEY, algorithm=ALGORITHM)}
+
+    def body(self):
+        return {
+            'content' : '비동기 리뷰',
+            'grade'   : 5,
+            'image'   : SimpleUploadedFile('review.jpg', b'image', content_type='image/jpeg')
+        }
+
+    @patch.object(ReviewView, 's3_client')
+    def test_post_review_uploads_before_saving(self, mocked_s3_client):
+        response = Client().post(f'/reviews/{Product.objects.get(id=1).id}', self.body(), **self.headers)
+
+        self.assertEqual(response.status_code, 201)
+
+        key    = mocked_s3_client.upload_fileobj.call_args.args[2]
+        review = Review.objects.get(image_uuid=key)
+        self.assertEqual(review.content, '비동기 리뷰')
+        self.assertTrue(review.image_url.endswith(key))
+
+    @patch.object(ReviewView, 'save_review', side_effect=ValueError)
+    @patch.object(ReviewView, 's3_client')
+    def test_post_review_failure_cleanup(self, mocked_s3_client, mocked_save_review):
+        with self.assertRaises(ValueError):
+            Client().post(f'/reviews/{Product.objects.get(id=1).id}', self.body(), **self.headers)
+
+        key     = mocked_s3_client.upload_fileobj.call_args.args[2]
+        deleted = mocked_s3_client.delete_objects.call_args.kwargs['Delete']['Objects']
+        self.assertEqual(deleted, [{'Key': key}])
+
+    @patch.object(ReviewView, 's3_client')
+    def test_post_review_upload_failed(self, mocked_s3_client):
+        mocked_s3_client.upload_fileobj.side_effect = ClientError({'Error': {'Code': '500'}}, 'PutObject')
+
+        response = Client().post(f'/reviews/{Product.objects.get(id=1).id}', self.body(), **self.headers)
+
+        self.assertEqual(response.json(), {'MESSAGE': 'UPLOAD_FAILED'})
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(Review.objects.filter(content='비동기 리뷰').exists())
+
+    @patch.object(ReviewView, 's3_client')
+    def test_post_review_with_presigned_key(self, mocked_s3_client):
+        mocked_s3_client.head_object.return_value = {'ContentType': 'image/jpeg'}
+        key  = f'uploads/{User.objects.get(id=2).id}/review'
+        body = {'content': '직접 업로드', 'grade': 5, 'image_key': key}
+
+        response = Client().post(f'/reviews/{Product.objects.get(id=1).id}', body, **self.headers)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mocked_s3_client.upload_fileobj.call_count, 0)
+        self.assertEqual(Review.objects.get(image_uuid=key).content, '직접 업로드')
+
+        response = Client().post(f'/reviews/{Product.objects.get(id=1).id}', body, **self.headers)
+        self.assertEqual(response.json(), {'MESSAGE': 'INVALID_IMAGE_KEY'})
@@ -1,65 +1,95 @@
-import json, boto3, uuid
+import json, boto3
 
 from time import timezone
 
-from django.http      import JsonResponse
-from django.views     import View
-from django.db        import transaction
+from core.utils          import database_sync_to_async
+from botocore.exceptions import BotoCoreError, ClientError
+from core.http           import JsonResponse
+from django.views        import View
+from django.db           import transaction
 
-from core.utils       import query_debugger
-from users.utils      import login
-from reviews.models   import Review
-from products.models  import Product
+from core.cache          import cache_response, invalidate_tags
+from core.pagination     import PaginationError, paginate, page_size
+from core.storage        import upload_files_async, delete_files_async, verify_uploads_async
+from core.views          import AsyncView
+from users.utils         import login, rate_limit
+from reviews.models      import Review
+from reviews.feed        import ORDERING, project, recent_reviews, serialize
+from products.models     import Product, Image
+from products.images     import enqueue_images
 
 
-from my_settings      import ACCESS_KEY_ID, BUCKET_NAME, SECRET_ACESS_KEY, AWS_S3_URL
+from my_settings         import ACCESS_KEY_ID, SECRET_ACESS_KEY, AWS_S3_URL
 
 
-class ReviewView(View):
+class ReviewView(AsyncView):
     s3_client = boto3.client(
         's3',
         aws_access_key_id     = ACCESS_KEY_ID,
         aws_secret_access_key = SECRET_ACESS_KEY,
     )    
     @login
-    def post(self, request, product_id):
+    @rate_limit('review_post')
+    async def post(self, request, product_id):
         try:
             content    = request.POST.get("content")
             grade      = request.POST.get("grade", None)
             image      = request.FILES.get('image', None)
+            image_key  = request.POST.get('image_key', None)
             
-            if not image:
+            if not image and not image_key:
                 return JsonResponse({"MESSAGE": "IMAGE_FILES_NONE"}, status=404)
 
             if not content:
                 return JsonResponse({"MESSAGE":"NO_CONTENT"}, status=400)
-            
-            with transaction.atomic():
-                review = Review.objects.create(
-                    user_id    = request.user.id,
-                    product_id = product_id,
-                    image_url  = None,
-                    image_uuid = str(uuid.uuid4()),
-                    content    = content,
-                    grade      = grade
-                )
-                
-                self.s3_client.upload_fileobj(
-                    image,
-                    BUCKET_NAME,
-                    review.image_uuid,
-                    ExtraArgs = {
-                        'ContentType' : image.content_type
-                    }
-                )
-                image_urls       = f"{AWS_S3_URL}/{review.image_uuid}"
-                review.image_url = image_urls
-                review.save() 
+
+            try:
+                if image_key:
+                    if not await self.verify_image_key(request.user, image_key):
+                        return JsonResponse({"MESSAGE": "INVALID_IMAGE_KEY"}, status=400)
+
+                    keys = [image_key]
+                else:
+                    keys = await upload_files_async(self.s3_client, [image])
+            except (BotoCoreError, ClientError):
+                return JsonResponse({"MESSAGE": "UPLOAD_FAILED"}, status=502)
+
+            try:
+                await database_sync_to_async(self.save_review)(request.user, product_id, content, grade, keys[0])
+            except Exception:
+                await delete_files_async(self.s3_client, keys)
+                raise
 
             return JsonResponse({'MESSAGE': "SUCCESS"}, status=201)
         except KeyError:
             return JsonResponse({"MESSAGE": "KEY_ERROR"}, status=400)
 
+    async def verify_image_key(self, user, key):
+        if await database_sync_to_async(self.key_in_use)(key):
+            return False
+
+        return await verify_uploads_async(self.s3_client, user.id, [key])
+
+    def key_in_use(self, key):
+        return Review.objects.filter(image_uuid=key).exists() or Image.objects.filter(image_uuid=key).exists()
+
+    def save_review(self, user, product_id, content, grade, key):
+        with transaction.atomic():
+            review = Review.objects.create(
+                user_id    = user.id,
+                product_id = product_id,
+                image_url  = f"{AWS_S3_URL}/{key}",
+                image_uuid = key,
+                content    = content,
+                grade      = grade
+            )
+            enqueue_images([key])
+
+            invalidate_tags('reviews')
+
+            if recent_reviews.enabled:
+                transaction.on_commit(lambda: recent_reviews.push(project(Review.objects.filter(id=review.id)).get()))
+
 
 class CommentView(View):
     @login
@@ -110,14 +140,28 @@ class CommentView(View):
 
 
 class RecentReviewView(View):
+    @cache_response('recent_review', params=('cursor', 'limit'), tags=('reviews',))
     def get(self, request):
-        reviews = Review.objects.filter(comment_id=None).select_related('product').order_by('-create_at')
+        cursor  = request.GET.get('cursor')
+        reviews = project(Review.objects.filter(comment_id=None))
+
+        try:
+            limit = page_size(request.GET.get('limit'))
+
+            if not cursor and recent_reviews.enabled:
+                if not recent_reviews.is_warm():
+                    recent_reviews.prime(list(reviews.order_by(*ORDERING)[:recent_reviews.size+1]))
+
+                page = recent_reviews.page(limit)
+
+                if page:
+                    recent_review, next_cursor = page
+                    return JsonResponse({"recent_review": recent_review, "next_cursor": next_cursor}, status=200)
+
+            reviews, next_cursor = paginate(reviews, ORDERING, cursor, limit)
+        except PaginationError as e:
+            return JsonResponse({"message": e.message}, status=400)
 
-        recent_review = [{
-            "product_name" : review.product.name,
-            "image_url"    : review.image_url,
-            "grade"        : review.grade,
-            "content"      : review.content
-        } for review in reviews]
+        recent_review = [serialize(review) for review in reviews]
 
-        return JsonResponse({"recent_review": recent_review}, status=200)
+        return JsonResponse({"recent_review": recent_review, "next_cursor": next_cursor}, status=200)
@@ -0,0 +1,37 @@
+from django.apps      import apps as global_apps
+from django.db.models import Count, Max
+
+
+REFERENCES = (('products', 'Product'), ('products', 'Order'), ('reviews', 'Review'))
+DERIVED    = (('products', 'SellerToken'), ('products', 'SellerStat'))
+
+
+def duplicate_groups(apps=global_apps):
+    User = apps.get_model('users', 'User')
+
+    return list(
+        User.objects.values('kakao_account')
+                    .annotate(count=Count('id'), keep=Max('id'))
+                    .filter(count__gt=1)
+                    .order_by('kakao_account')
+    )
+
+
+def merge_duplicate_users(apps=global_apps):
+    User   = apps.get_model('users', 'User')
+    merged = {}
+
+    for group in duplicate_groups(apps):
+        keep = group['keep']
+        ids  = list(User.objects.filter(kakao_account=group['kakao_account']).exclude(id=keep).values_list('id', flat=True))
+
+        for app_label, model_name in REFERENCES:
+            apps.get_model(app_label, model_name).objects.filter(user_id__in=ids).update(user_id=keep)
+
+        for app_label, model_name in DERIVED:
+            apps.get_model(app_label, model_name).objects.filter(user_id__in=ids).delete()
+
+        User.objects.filter(id__in=ids).delete()
+        merged[keep] = ids
+
+    return merged
@@ -0,0 +1,71 @@
+import asyncio, httpx, weakref
+
+from django.conf import settings
+
+from core.cache  import TTLCache
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+profile_cache = TTLCache(settings.KAKAO_PROFILE_CACHE_SIZE, settings.KAKAO_PROFILE_CACHE_TTL)
+clients       = weakref.WeakKeyDictionary()
+
+
+class KakaoError(Exception):
+    pass
+
+
+def kakao_client():
+    loop = asyncio.get_running_loop()
+
+    if loop not in clients:
+        clients[loop] = httpx.AsyncClient(
+            timeout = settings.KAKAO_TIMEOUT,
+            limits  = httpx.Limits(
+                max_connections           = settings.KAKAO_MAX_CONNECTIONS,
+                max_keepalive_connections = settings.KAKAO_MAX_CONNECTIONS
+            )
+        )
+
+    return clients[loop]
+
+
+async def close_client():
+    client = clients.pop(asyncio.get_running_loop(), None)
+
+    if client:
+        await client.aclose()
+
+
+async def request_profile(access_token):
+    headers = {'Authorization' : 'Bearer {}'.format(access_token)}
+
+    for attempt in range(settings.KAKAO_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(settings.KAKAO_BACKOFF * 2 ** (attempt - 1))
+
+        try:
+            response = await kakao_client().get(settings.KAKAO_API_URL, headers=headers)
+        except httpx.TransportError as e:
+            error = e
+            continue
+
+        if response.status_code not in RETRY_STATUSES:
+            return response
+
+        error = KakaoError(f'kakao responded {response.status_code}')
+
+    raise KakaoError('kakao unavailable') from error
+
+
+async def fetch_profile(access_token):
+    profile = profile_cache.get(access_token)
+
+    if profile is None:
+        response = await request_profile(access_token)
+        profile  = response.json()
+
+        if response.status_code == 200:
+            profile_cache.set(access_token, profile)
+
+    return profile
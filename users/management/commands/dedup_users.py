@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db                   import transaction
+
+from core.cache                  import invalidate_tags
+from products.models             import Product
+from products.search             import index_product, index_seller
+from products.stats              import rebuild
+from users.dedup                 import duplicate_groups, merge_duplicate_users
+from users.models                import User
+from users.utils                 import invalidate_user
+
+
+class Command(BaseCommand):
+    help = (
+        'Merge users that share a kakao_account into the most recent row. Products, orders and reviews are moved '
+        'to the kept user, seller tokens and seller stats are rebuilt. Run before migrating users to 0002.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        groups = duplicate_groups()
+
+        for group in groups:
+            self.stdout.write(f"kakao_account={group['kakao_account']}: {group['count']} rows, keeping {group['keep']}")
+
+        if options['dry_run'] or not groups:
+            self.stdout.write(f"{len(groups)} duplicate accounts")
+            return
+
+        with transaction.atomic():
+            merged = merge_duplicate_users()
+
+            for user in User.objects.filter(id__in=merged).only('id', 'name'):
+                index_seller(user)
+
+                for product in Product.objects.filter(user_id=user.id).only('id', 'name', 'description'):
+                    index_product(product, user.name)
+
+            rebuild()
+
+            for keep, ids in merged.items():
+                for user_id in [keep, *ids]:
+                    transaction.on_commit(lambda user_id=user_id: invalidate_user(user_id))
+
+            invalidate_tags('sellers', 'products', 'reviews', *[f'seller:{keep}' for keep in merged])
+
+        self.stdout.write(self.style.SUCCESS(f"merged {sum(len(ids) for ids in merged.values())} users into {len(merged)}"))
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.6 on 2026-10-18 10:27
+
+from django.db import migrations, models
+
+from users.dedup import merge_duplicate_users
+
+
+def merge_duplicates(apps, schema_editor):
+    merge_duplicate_users(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('products', '0006_composite_indexes'),
+        ('reviews', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='kakao_account',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
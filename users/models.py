@@ -1,7 +1,7 @@
 from django.db import models
 
 class User(models.Model):
-    kakao_account = models.CharField(max_length=100)
+    kakao_account = models.CharField(max_length=100, unique=True)
     point         = models.IntegerField(default=100000)
     name          = models.CharField(max_length=100)
     profile_image = models.URLField(max_length=500)
@@ -1,7 +1,20 @@
-from django.test   import Client, TestCase
-from unittest.mock import patch, MagicMock
+import json, jwt, threading
 
-from users.models  import User
+from io                            import StringIO
+from http.server                   import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management        import call_command
+from django.core.cache             import caches
+from django.db                     import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test                   import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from unittest.mock                 import patch
+
+from products.models               import Product, SellerToken
+from users.models                  import User
+from users.kakao                   import KakaoError, fetch_profile, kakao_client, profile_cache
+from users.utils                   import token_cache, user_cache, decode_token, get_user
+from my_settings                   import SECRET_KEY, ALGORITHM
 
 
 
@@ -11,15 +24,15 @@ class KakaoSignInTest(TestCase):
         User.objects.create(
             name="지선", 
             kakao_account=1855324271, 
-            profile_image_url='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
+            profile_image='http://k.kakaocdn.net/dn/dScJVH/btq7DShllEz/3X2kXV9W5anK3nmcitWoWk/img_640x640.jpg',
             email='rhadlfrhq@naver.com'
             )
 
     def tearDown(self):
         User.objects.all().delete() 
 
-    @patch('users.views.requests')
-    def test_kakao_sign_in(self, mocked_request):
+    @patch('users.views.fetch_profile')
+    def test_kakao_sign_in(self, mocked_fetch_profile):
         class FakeResponse:
             def json(self):
                 return {
@@ -44,8 +57,249 @@ class KakaoSignInTest(TestCase):
                             'email': 'rhadlfrhq@naver.com'}
 }      
 
-        mocked_request.get = MagicMock(return_value = FakeResponse())
+        mocked_fetch_profile.return_value = FakeResponse().json()
         c = Client()
         header   = {'HTTP_Authorization':'fake_token.1234'}
         response = c.get('/users/login/kakao', content_type='applications/json', **header)
-        self.assertEqual(response.status_code, 200)
\ No newline at end of file
+        self.assertEqual(response.status_code, 201)
+
+class LoginCacheTest(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        user_cache.clear()
+
+        self.user = User.objects.create(
+            name          = "지선",
+            kakao_account = "1855324271",
+            profile_image = 'http://k.kakaocdn.net/img_640x640.jpg',
+            email         = 'rhadlfrhq@naver.com'
+        )
+
+    def test_get_user_cached(self):
+        get_user(self.user.id)
+
+        with self.assertNumQueries(0):
+            user = get_user(self.user.id)
+
+        self.assertEqual(user.name, "지선")
+        self.assertFalse(user._state.adding)
+
+    def test_get_user_invalidated_on_save(self):
+        get_user(self.user.id)
+
+        self.user.name = "지선2"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user = get_user(self.user.id)
+
+        self.assertEqual(user.name, "지선2")
+
+    def test_get_user_invalidated_on_delete(self):
+        get_user(self.user.id)
+        user_id = self.user.id
+        self.user.delete()
+
+        with self.assertRaises(User.DoesNotExist):
+            get_user(user_id)
+
+    @override_settings(USER_CACHE_ALIAS='default')
+    def test_get_user_shared_cache_skips_local_layer(self):
+        caches['default'].clear()
+        get_user(self.user.id)
+
+        User.objects.filter(id=self.user.id).update(name="지선2")
+        caches['default'].delete(f'user:{self.user.id}')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user(self.user.id).name, "지선2")
+
+        self.assertIsNone(user_cache.get(f'user:{self.user.id}'))
+
+    @patch('users.utils.jwt.decode', wraps=jwt.decode)
+    def test_decode_token_cached(self, mocked_decode):
+        token = jwt.encode({'id': self.user.id}, SECRET_KEY, algorithm=ALGORITHM)
+
+        self.assertEqual(decode_token(token), {'id': self.user.id})
+        self.assertEqual(decode_token(token), {'id': self.user.id})
+        self.assertEqual(mocked_decode.call_count, 1)
+
+
+class AsyncKakaoLoginTest(TestCase):
+    @patch('users.views.fetch_profile')
+    def test_kakao_login_async(self, mocked_fetch_profile):
+        mocked_fetch_profile.return_value = {
+            'id'            : 'async-kakao',
+            'kakao_account' : {
+                'email'   : 'async@kakao.com',
+                'profile' : {'nickname': '비동기', 'profile_image_url': 'http://example.com/profile.jpg'}
+            }
+        }
+
+        response = Client().get('/users/login/kakao', HTTP_Authorization='fake_token.1234')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user_name'], '비동기')
+        self.assertEqual(decode_token(response.json()['TOKEN'])['id'], User.objects.get(kakao_account='async-kakao').id)
+        mocked_fetch_profile.assert_awaited_once_with('fake_token.1234')
+
+    async def test_kakao_client_shared_per_loop(self):
+        self.assertIs(kakao_client(), kakao_client())
+
+
+class KakaoStandIn(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.headers['Authorization'], self.client_address[1]))
+
+        status = server.statuses.pop(0) if server.statuses else 200
+        body   = json.dumps({'id': 1, 'kakao_account': {'email': 'stand-in@kakao.com'}}).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class KakaoClientTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KakaoStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        profile_cache.clear()
+        self.server.requests = []
+        self.server.statuses = []
+        self.settings = override_settings(
+            KAKAO_API_URL = f'http://127.0.0.1:{self.server.server_address[1]}/v2/user/me',
+            KAKAO_BACKOFF = 0
+        )
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+
+    async def test_keep_alive_connection_reused(self):
+        await fetch_profile('token-a')
+        await fetch_profile('token-b')
+
+        self.assertEqual([token for token, _ in self.server.requests], ['Bearer token-a', 'Bearer token-b'])
+        self.assertEqual(len({port for _, port in self.server.requests}), 1)
+
+    async def test_profile_cached_per_token(self):
+        first  = await fetch_profile('token-a')
+        second = await fetch_profile('token-a')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.server.requests), 1)
+
+    async def test_retry_on_server_error(self):
+        self.server.statuses = [503, 502]
+
+        profile = await fetch_profile('token-a')
+
+        self.assertEqual(profile['id'], 1)
+        self.assertEqual(len(self.server.requests), 3)
+
+    async def test_retries_exhausted(self):
+        self.server.statuses = [503, 503, 503]
+
+        with self.assertRaises(KakaoError):
+            await fetch_profile('token-a')
+
+        self.assertIsNone(profile_cache.get('token-a'))
+
+    async def test_client_error_not_cached(self):
+        self.server.statuses = [401]
+
+        await fetch_profile('token-a')
+        await fetch_profile('token-a')
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    @patch('users.views.fetch_profile', side_effect=KakaoError)
+    def test_kakao_unavailable(self, mocked_fetch_profile):
+        response = Client().get('/users/login/kakao', HTTP_Authorization='fake_token.1234')
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(response.json()['MESSAGE'], 'KAKAO_UNAVAILABLE')
+
+
+class KakaoProfileUpdateTest(TestCase):
+    def profile(self, nickname='과팡', image='http://example.com/profile.jpg'):
+        return {
+            'id'            : 424242,
+            'kakao_account' : {
+                'email'   : 'update@kakao.com',
+                'profile' : {'nickname': nickname, 'profile_image_url': image}
+            }
+        }
+
+    def login(self, profile):
+        with patch('users.views.fetch_profile', return_value=profile):
+            return Client().get('/users/login/kakao', HTTP_Authorization='fake_token.1234')
+
+    def test_repeat_login_without_changes_does_not_write(self):
+        self.login(self.profile())
+
+        with self.assertNumQueries(1):
+            response = self.login(self.profile())
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_profile_change_updates_same_user(self):
+        self.login(self.profile())
+        response = self.login(self.profile(nickname='새이름', image='http://example.com/new.jpg'))
+
+        user = User.objects.get(kakao_account='424242')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.count(), 1)
+        self.assertEqual((user.name, user.profile_image), ('새이름', 'http://example.com/new.jpg'))
+        self.assertTrue(SellerToken.objects.filter(user_id=user.id, token='새이').exists())
+        self.assertFalse(SellerToken.objects.filter(user_id=user.id, token='과팡').exists())
+
+
+class DedupUsersTest(TransactionTestCase):
+    def setUp(self):
+        MigrationExecutor(connection).migrate([('users', '0001_initial')])
+
+        self.old = User.objects.create(kakao_account='dup', name='옛이름', profile_image='old', point=100)
+        self.new = User.objects.create(kakao_account='dup', name='새이름', profile_image='new', point=200)
+        self.product = Product.objects.create(user_id=self.old.id, name='사과', price=1000, description='', stock=1)
+
+        SellerToken.objects.create(user_id=self.old.id, token='옛이')
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_dedup_users_command(self):
+        call_command('dedup_users', dry_run=True, stdout=StringIO())
+        self.assertEqual(User.objects.filter(kakao_account='dup').count(), 2)
+
+        call_command('dedup_users', stdout=StringIO())
+
+        self.assertEqual(list(User.objects.filter(kakao_account='dup').values_list('id', flat=True)), [self.new.id])
+        self.assertEqual(Product.objects.get(id=self.product.id).user_id, self.new.id)
+        self.assertFalse(SellerToken.objects.filter(user_id=self.old.id).exists())
+        self.assertTrue(SellerToken.objects.filter(user_id=self.new.id, token='새이').exists())
+
+    def test_migration_merges_duplicates(self):
+        MigrationExecutor(connection).migrate([('users', '0002_unique_kakao_account')])
+
+        self.assertEqual(list(User.objects.filter(kakao_account='dup').values_list('id', flat=True)), [self.new.id])
+        self.assertEqual(Product.objects.get(id=self.product.id).user_id, self.new.id)
@@ -1,29 +1,156 @@
-import jwt 
+import asyncio, jwt, time
 
-from django.http.response   import JsonResponse
+from core.utils             import database_sync_to_async
+from django.conf            import settings
+from django.core.cache      import caches
+from core.http              import JsonResponse
 from users.models           import User
+from core.cache             import TTLCache
+from core.ratelimit         import acquire, release
 from my_settings            import SECRET_KEY, ALGORITHM
-from django.core.exceptions import ObjectDoesNotExist     
+from django.core.exceptions import ObjectDoesNotExist
 
 
+USER_FIELDS = ('id', 'kakao_account', 'point', 'name', 'profile_image', 'email', 'image_url')
+
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
+user_cache  = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+
+
+def shared_user_cache():
+    return caches[settings.USER_CACHE_ALIAS] if settings.USER_CACHE_ALIAS else None
+
+
+def decode_token(token):
+    payload = token_cache.get(token)
+
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+        ttl     = settings.TOKEN_CACHE_TTL
+
+        if 'exp' in payload:
+            ttl = min(ttl, payload['exp'] - time.time())
+
+        token_cache.set(token, payload, ttl)
+
+    return payload
+
+
+def get_user(user_id):
+    key    = f'user:{user_id}'
+    cache  = shared_user_cache() or user_cache
+    fields = cache.get(key)
+
+    if fields is None:
+        fields = User.objects.values(*USER_FIELDS).get(id=user_id)
+        cache.set(key, fields, settings.USER_CACHE_TTL)
+
+    return User.from_db('default', list(fields), list(fields.values()))
+
+
+def invalidate_user(user_id):
+    key    = f'user:{user_id}'
+    shared = shared_user_cache()
+
+    user_cache.delete(key)
+
+    if shared:
+        shared.delete(key)
+
+
+def authenticate(request):
+    try:
+        token        = request.headers.get('Authorization', None)
+        payload      = decode_token(token)
+        user         = get_user(payload['id'])
+        request.user = user
+
+    except jwt.exceptions.DecodeError:
+        return JsonResponse({'MESSAGE' : 'INVALID_TOKEN' }, status=400)
+
+    except User.DoesNotExist:
+        return JsonResponse({'MESSAGE' : 'INVALID_USER'}, status=400)
+
 
 def login(func):
+    if asyncio.iscoroutinefunction(func):
+        async def async_wrapper(self, request, *args, **kwargs):
+            error = await database_sync_to_async(authenticate)(request)
+
+            if error:
+                return error
+
+            return await func(self, request, *args, **kwargs)
+
+        return async_wrapper
+
     def wrapper(self, request, *args, **kwargs):
-        try:
-            token        = request.headers.get('Authorization', None)
-            payload      = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-            user         = User.objects.get(id=payload['id'])
-            request.user = user
-        
-        except jwt.exceptions.DecodeError:
-            return JsonResponse({'MESSAGE' : 'INVALID_TOKEN' }, status=400)
-
-        except User.DoesNotExist:
-            return JsonResponse({'MESSAGE' : 'INVALID_USER'}, status=400)
+        error = authenticate(request)
+
+        if error:
+            return error
 
         return func(self, request, *args, **kwargs)
 
     return wrapper
 
-            
 
+def throttle(scope, request):
+    if scope not in settings.RATE_LIMITS:
+        return None, None
+
+    limit, period = settings.RATE_LIMITS[scope]
+
+    return acquire(f'ratelimit:{scope}:{request.user.id}', limit, period)
+
+
+def too_many_requests(retry_after):
+    response                = JsonResponse({'MESSAGE' : 'TOO_MANY_REQUESTS'}, status=429)
+    response['Retry-After'] = str(retry_after)
+
+    return response
+
+
+def rate_limit(scope):
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            async def async_wrapper(self, request, *args, **kwargs):
+                slot, retry_after = await database_sync_to_async(throttle)(scope, request)
+
+                if retry_after:
+                    return too_many_requests(retry_after)
+
+                try:
+                    response = await func(self, request, *args, **kwargs)
+                except Exception:
+                    if slot:
+                        await database_sync_to_async(release)(slot)
+                    raise
+
+                if slot and response.status_code >= 400:
+                    await database_sync_to_async(release)(slot)
+
+                return response
+
+            return async_wrapper
+
+        def wrapper(self, request, *args, **kwargs):
+            slot, retry_after = throttle(scope, request)
+
+            if retry_after:
+                return too_many_requests(retry_after)
+
+            try:
+                response = func(self, request, *args, **kwargs)
+            except Exception:
+                if slot:
+                    release(slot)
+                raise
+
+            if slot and response.status_code >= 400:
+                release(slot)
+
+            return response
+
+        return wrapper
+    return decorator
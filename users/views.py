@@ -1,39 +1,67 @@
-import jwt, requests, random
+import jwt, random
 
-from django.views         import View
-from django.http.response import JsonResponse
+from core.utils           import database_sync_to_async
+from django.db            import transaction
+from core.http            import JsonResponse
 
 from my_settings          import SECRET_KEY, ALGORITHM
+from core.cache           import invalidate_tags
+from core.views           import AsyncView
 from users.models         import User
+from users.kakao          import KakaoError, fetch_profile
+from products.models      import Product
+from products.search      import index_product, index_seller
 
 
-class KakaoLoginView(View):
-    def get(self, request):
+class KakaoLoginView(AsyncView):
+    async def get(self, request):
         try:
             access_token = request.headers['Authorization']
-            url          = "https://kapi.kakao.com/v2/user/me"
-            header       = {
-                'Authorization' : 'Bearer {}'.format(access_token)
-            }
-            response = requests.get(url, headers = header).json()                
-            
-            user, is_user = User.objects.get_or_create(
-                kakao_account     = response['id'], 
-                email             = response['kakao_account']['email'], 
-                name              = response['kakao_account']['profile']['nickname'],
-                profile_image     = response['kakao_account']['profile']['profile_image_url'],
-
-            )
+            response     = await fetch_profile(access_token)
+
+            user, is_user = await database_sync_to_async(self.get_or_create_user)(response)
+
+            token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
+
             if is_user:
-                token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
                 return JsonResponse({'MESSAGE': 'SUCCESS', 'user_name': user.name, 'TOKEN': token}, status = 200)
             else:
-                token = jwt.encode({'id': user.id}, SECRET_KEY, algorithm=ALGORITHM)
                 return JsonResponse({'MESSAGE': 'SUCCESS', 'user_name': user.name, 'TOKEN': token}, status = 201)
 
         except KeyError:
             return JsonResponse({'message': 'KEY_ERROR'}, status=400)
 
+        except KakaoError:
+            return JsonResponse({'MESSAGE': 'KAKAO_UNAVAILABLE'}, status=502)
+
+    def get_or_create_user(self, response):
+        profile = {
+            'email'         : response['kakao_account']['email'],
+            'name'          : response['kakao_account']['profile']['nickname'],
+            'profile_image' : response['kakao_account']['profile']['profile_image_url'],
+        }
+
+        user, is_user = User.objects.get_or_create(kakao_account=response['id'], defaults=profile)
+
+        if is_user:
+            index_seller(user)
+            invalidate_tags('sellers')
+            return user, is_user
+
+        changed = [field for field, value in profile.items() if getattr(user, field) != value]
+
+        if changed:
+            with transaction.atomic():
+                for field in changed:
+                    setattr(user, field, profile[field])
+                user.save(update_fields=changed)
+
+                if 'name' in changed:
+                    index_seller(user)
 
+                    for product in Product.objects.filter(user_id=user.id).only('id', 'name', 'description'):
+                        index_product(product, user.name)
 
+                invalidate_tags('sellers', 'products', f'seller:{user.id}')
 
+        return user, is_user